@@ -1,4 +1,6 @@
-from count_rows_under_string import collect_all_occurrences_combined
+from count_rows_under_string import DEFAULT_WINDOW, collect_all_occurrences_combined
+from json_output import write_json
+import argparse
 import json
 
 
@@ -14,6 +16,59 @@ def normalize_key(key):
     return key
 
 
+# Section header -> (level field, rows under the header that are counted)
+DEFAULT_SECTIONS = {
+    "Obstacle Type": ("num_obstacles", DEFAULT_WINDOW),
+}
+
+
+def parse_section_spec(spec):
+    """
+    Parse a --section value 'HEADER=FIELD' or 'HEADER=FIELD:WINDOW', e.g.
+    'Ingredient Type=num_ingredients:8', into (header, (field, window))
+    """
+    header, sep, target = spec.rpartition("=")
+    if not sep or not header.strip() or not target:
+        raise ValueError(f"Expected HEADER=FIELD[:WINDOW], got '{spec}'")
+    field, _, window = target.partition(":")
+    return header.strip(), (field, int(window) if window else DEFAULT_WINDOW)
+
+
+def section_counts(combined_results):
+    """{level key: total non-empty rows under the section} from one section's combined_results"""
+    counts = {}
+    for key, occurrences in combined_results.items():
+        # Normalize dictionary keys first
+        level_key = normalize_key(key)
+        counts[level_key] = sum(occurrence["non_empty_count"] for occurrence in occurrences)
+    return counts
+
+
+def add_sections_to_levels(data, section_results, sections=None):
+    """
+    data: levels dict keyed like 'Level_1_1', updated in place
+    section_results: dict from collect_sections_combined()
+    sections: {header: (field, window)}, default DEFAULT_SECTIONS; each
+    header's count is stored in its field, 0 for levels without that section
+    """
+    sections = DEFAULT_SECTIONS if sections is None else sections
+    for header, (field, _) in sections.items():
+        counts = section_counts(section_results.get(header, {}))
+        for level_key, level_data in data.items():
+            level_data[field] = counts.get(level_key, 0)
+
+    return data
+
+
+def add_obstacles_to_levels(data, combined_results):
+    """
+    data: levels dict keyed like 'Level_1_1', updated in place
+    combined_results: dict from collect_all_occurrences_combined()
+    """
+    return add_sections_to_levels(data, {"Obstacle Type": combined_results},
+                                  {"Obstacle Type": DEFAULT_SECTIONS["Obstacle Type"]})
+
+
 def add_obstacles_to_json(json_path, combined_results, output_path):
     """
     json_path: path to original JSON file
@@ -25,41 +80,32 @@ def add_obstacles_to_json(json_path, combined_results, output_path):
     with open(json_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    # Normalize dictionary keys first
-    normalized_results = {
-        normalize_key(k): v
-        for k, v in combined_results.items()
-    }
-
-    # Process each JSON entry
-    for level_key, level_data in data.items():
-
-        if level_key in normalized_results:
-            total_obstacles = sum(
-                occurrence["non_empty_count"]
-                for occurrence in normalized_results[level_key]
-            )
-        else:
-            total_obstacles = 0
-
-        level_data["num_obstacles"] = total_obstacles
+    add_obstacles_to_levels(data, combined_results)
 
     # Write updated JSON to file
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    write_json(output_path, data, indent=2)
 
     return data
 
 
-file_path = "C:\\Users\\roser\\Documents\\coding-projects\\overcooked-website\\React-Version\\overcooked-lvl-selector-react\\Overcooked 2 Full Task Analysis.xlsx"
-search_string = "Obstacle Type"
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Add num_obstacles counts from the workbook to a levels JSON file")
+    parser.add_argument("excel_file", nargs="?", default="Overcooked 2 Full Task Analysis.xlsx",
+                        help="task analysis workbook (default: %(default)s)")
+    parser.add_argument("--json", default="overcooked_levels_data.json",
+                        help="levels JSON to update (default: %(default)s)")
+    parser.add_argument("-o", "--output", default="levels_with_obstacles.json",
+                        help="output JSON file (default: %(default)s)")
+    args = parser.parse_args()
+
+    combined_results = collect_all_occurrences_combined(args.excel_file, "Obstacle Type")
+    add_obstacles_to_json(
+        json_path=args.json,
+        combined_results=combined_results,
+        output_path=args.output
+    )
 
-combined_results  = collect_all_occurrences_combined(file_path, search_string)
-# print(combined_results)
-updated_json = add_obstacles_to_json(
-    json_path="public/all_levels.json",
-    combined_results=combined_results,
-     output_path="levels_with_obstacles.json"
-)
 
-# print(json.dumps(updated_json, indent=2))
\ No newline at end of file
+if __name__ == "__main__":
+    main()
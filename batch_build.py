@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Build one level catalog from many task analysis workbooks (one per game or DLC).
+
+Takes workbook files, directories and glob patterns, runs the
+build_level_data.py stages for each workbook in a process pool, and merges
+the results into one catalog whose level keys are prefixed with the source
+workbook's name, e.g. "overcooked_2:Level_1_1".
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from parse_overcooked_data import DEFAULT_MODE, PARSE_MODES, open_for_mode, worker_count
+from count_rows_under_string import open_values_workbook
+from add_obstacles_to_json import DEFAULT_SECTIONS, parse_section_spec
+from build_level_data import build_levels
+from json_output import write_json
+from instrumentation import (LogCollector, add_logging_arguments, capture_worker_logging,
+                             configure_from_args, get_logger)
+
+
+logger = get_logger("batch")
+
+
+# Separates the source name from the level key in catalog keys
+NAMESPACE_SEPARATOR = ":"
+
+
+def expand_inputs(inputs):
+    """
+    Workbook paths for a list of files, directories (every .xlsx inside) and
+    glob patterns, in the order given, without duplicates or Excel lock files
+    """
+    paths = []
+    for entry in inputs:
+        path = Path(entry)
+        if path.is_dir():
+            matches = sorted(path.glob("*.xlsx"))
+        elif glob.has_magic(entry):
+            matches = sorted(Path(match) for match in glob.glob(entry, recursive=True))
+        else:
+            matches = [path]
+
+        if not matches:
+            logger.warning("No workbooks match '%s'", entry)
+        for match in matches:
+            if match.name.startswith("~$"):
+                continue
+            if match not in paths:
+                paths.append(match)
+    return paths
+
+
+def source_names(paths):
+    """
+    Namespace per workbook from its file name, e.g.
+    'Overcooked 2 Full Task Analysis.xlsx' -> 'overcooked_2_full_task_analysis';
+    repeated names get a numeric suffix
+    """
+    names = {}
+    used = set()
+    for path in paths:
+        base = re.sub(r'[^0-9a-z]+', '_', path.stem.lower()).strip('_') or "workbook"
+        name, n = base, 2
+        while name in used:
+            name, n = f"{base}_{n}", n + 1
+        used.add(name)
+        names[path] = name
+    return names
+
+
+def build_workbook(path, mode=DEFAULT_MODE, sections=None):
+    """Run every build stage on one workbook. Returns (levels_data, stats, seconds)"""
+    start = time.perf_counter()
+    stats = {}
+    wb = open_for_mode(path, mode)
+    values_wb = open_values_workbook(path)
+    try:
+        levels_data = build_levels(wb, mode=mode, stats=stats, sections=sections, values_wb=values_wb)
+    finally:
+        wb.close()
+        values_wb.close()
+    return levels_data, stats, time.perf_counter() - start
+
+
+def try_build_workbook(path, mode=DEFAULT_MODE, sections=None):
+    """build_workbook, with a failure returned as the error message so the rest of a batch still runs"""
+    try:
+        return (*build_workbook(path, mode, sections), None)
+    except Exception as e:
+        return None, {}, 0.0, f"{type(e).__name__}: {e}"
+
+
+def _init_batch_worker(log_level):
+    capture_worker_logging(log_level)
+
+
+def _build_in_worker(path, mode, sections):
+    """Build one workbook in a pool worker; log records are returned for the parent to replay"""
+    with LogCollector() as collector:
+        result = try_build_workbook(path, mode, sections)
+    return result, collector.records
+
+
+def build_all(paths, mode=DEFAULT_MODE, sections=None, workers=None, on_result=None):
+    """
+    Build every workbook, in a process pool unless workers == 1.
+    on_result(path, levels_data, stats, seconds, error) is called as each
+    workbook finishes. Returns {path: (levels_data, stats, seconds, error)}.
+    """
+    results = {}
+
+    def finish(path, result):
+        results[path] = result
+        if on_result:
+            on_result(path, *result)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                     initargs=(logger.getEffectiveLevel(),)) as executor:
+                futures = {executor.submit(_build_in_worker, str(path), mode, sections): path
+                           for path in paths}
+                for future in as_completed(futures):
+                    result, records = future.result()
+                    LogCollector.replay(records)
+                    finish(futures[future], result)
+            return results
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning("Process pool failed (%s), building the remaining workbooks serially", e)
+
+    for path in paths:
+        if path not in results:
+            finish(path, try_build_workbook(path, mode, sections))
+    return results
+
+
+def merge_catalog(paths, results):
+    """
+    One catalog from per-workbook results, in input order:
+    {"sources": {name: {...}}, "levels": {"name:Level_1_1": {..., "source": name}}}
+    """
+    names = source_names(paths)
+    catalog = {"sources": {}, "levels": {}}
+    for path in paths:
+        levels_data, _, seconds, error = results[path]
+        name = names[path]
+        catalog["sources"][name] = {
+            "path": str(path),
+            "levels": 0 if levels_data is None else len(levels_data),
+            "seconds": round(seconds, 3),
+        }
+        if error is not None:
+            catalog["sources"][name]["error"] = error
+            continue
+
+        for level_key, level_data in levels_data.items():
+            level_data["source"] = name
+            catalog["levels"][f"{name}{NAMESPACE_SEPARATOR}{level_key}"] = level_data
+    return catalog
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("inputs", nargs="+",
+                        help="workbook files, directories of .xlsx files or glob patterns")
+    parser.add_argument("-o", "--output", default="level_catalog.json",
+                        help="catalog JSON file (default: %(default)s)")
+    parser.add_argument("--workers", type=worker_count, default=0,
+                        help="workbooks built in parallel, 1 for serial (default: one per CPU)")
+    parser.add_argument("--mode", choices=sorted(PARSE_MODES), default=DEFAULT_MODE,
+                        help="sheet parser used for field extraction (default: %(default)s)")
+    parser.add_argument("--section", action="append", default=[], metavar="HEADER=FIELD[:WINDOW]",
+                        help="also count the rows under section header HEADER into FIELD (repeatable)")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    report = configure_from_args(args)
+
+    try:
+        sections = dict(DEFAULT_SECTIONS)
+        sections.update(parse_section_spec(spec) for spec in args.section)
+    except ValueError as e:
+        parser.error(str(e))
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        logger.error("No workbooks to build")
+        return
+
+    done = []
+
+    def progress(path, levels_data, stats, seconds, error):
+        done.append(path)
+        if error is not None:
+            logger.error("[%d/%d] %s failed: %s", len(done), len(paths), path, error)
+            report.count("workbooks_failed")
+            return
+        print(f"[{len(done)}/{len(paths)}] {path}: {len(levels_data)} levels in {seconds:.2f}s")
+        report.count_all(stats)
+        report.count("workbooks_built")
+
+    with report.stage("build"):
+        results = build_all(paths, mode=args.mode, sections=sections, workers=args.workers,
+                            on_result=progress)
+
+    with report.stage("write"):
+        catalog = merge_catalog(paths, results)
+        write_json(args.output, catalog, level_diff=False, indent=2, ensure_ascii=False)
+
+    print(f"✓ {len(catalog['levels'])} levels from {len(paths)} workbooks written to {args.output}")
+
+    if args.report:
+        report.write(args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Time and memory-profile each data build stage on a synthetic workbook.
+
+Generates a workbook with synthetic_workbook.py (or uses --workbook), runs
+every stage --repeat times, measures peak traced memory in one extra run,
+and writes the results as JSON so runs can be compared across commits.
+"""
+
+import argparse
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from parse_overcooked_data import DEFAULT_MODE, open_for_mode, parse_excel_file
+from count_rows_under_string import collect_all_occurrences_combined, open_values_workbook
+from add_obstacles_to_json import add_obstacles_to_levels
+from add_challenge_score_to_json import calculate_challenge_scores
+from build_level_data import OBSTACLE_SEARCH_STRING, build_levels
+from synthetic_workbook import generate_workbook
+
+
+def run_pipeline(workbook_path):
+    """Single-pass build of one workbook, closing it afterwards"""
+    wb = open_for_mode(workbook_path, DEFAULT_MODE)
+    values_wb = open_values_workbook(workbook_path)
+    try:
+        return build_levels(wb, values_wb=values_wb)
+    finally:
+        wb.close()
+        values_wb.close()
+
+
+def build_stages(workbook_path):
+    """Return {stage name: zero-argument callable}; inputs for later stages are prepared up front"""
+    levels_data = parse_excel_file(workbook_path)
+    combined_results = collect_all_occurrences_combined(workbook_path, OBSTACLE_SEARCH_STRING)
+    levels_with_obstacles = add_obstacles_to_levels(copy.deepcopy(levels_data), combined_results)
+
+    return {
+        "parse_scan": lambda: parse_excel_file(workbook_path, mode="scan"),
+        "parse_indexed": lambda: parse_excel_file(workbook_path, mode="indexed"),
+        "parse_stream": lambda: parse_excel_file(workbook_path, mode="stream"),
+        "obstacle_count": lambda: collect_all_occurrences_combined(workbook_path, OBSTACLE_SEARCH_STRING),
+        "challenge_score": lambda: calculate_challenge_scores(copy.deepcopy(levels_with_obstacles)),
+        "pipeline": lambda: run_pipeline(workbook_path),
+    }
+
+
+def measure(stage, repeat):
+    """Run a stage `repeat` times for timing, then once under tracemalloc for peak memory"""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        seconds.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": seconds,
+        "min_seconds": min(seconds),
+        "median_seconds": statistics.median(seconds),
+        "peak_memory_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workbook", help="benchmark this workbook instead of generating one")
+    parser.add_argument("--worlds", type=int, default=6)
+    parser.add_argument("--levels", type=int, default=6, help="levels per world")
+    parser.add_argument("--rows", type=int, default=80, help="rows per World sheet")
+    parser.add_argument("--extra-sheets", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", help="only run these stages")
+    parser.add_argument("-o", "--output", default="benchmark_results.json",
+                        help="results file (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.workbook:
+            workbook_path = Path(args.workbook)
+            params = {"workbook": str(workbook_path)}
+        else:
+            workbook_path = Path(tmp_dir) / "synthetic.xlsx"
+            params = {"worlds": args.worlds, "levels_per_world": args.levels,
+                      "rows": args.rows, "extra_sheets": args.extra_sheets}
+            generate_workbook(workbook_path, args.worlds, args.levels, args.rows, args.extra_sheets)
+        params["workbook_bytes"] = workbook_path.stat().st_size
+
+        stages = build_stages(workbook_path)
+        if args.stages:
+            unknown = set(args.stages) - set(stages)
+            if unknown:
+                parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+            stages = {name: stages[name] for name in args.stages}
+
+        results = {}
+        for name, stage in stages.items():
+            results[name] = measure(stage, args.repeat)
+            print(f"{name:16s} median {results[name]['median_seconds']:.4f}s"
+                  f"  peak {results[name]['peak_memory_mb']:.1f} MB")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": params,
+        "repeat": args.repeat,
+        "stages": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
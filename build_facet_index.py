@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Build the facet index that Levels.js filters with.
+
+For every filter on the Levels page the index maps each filter value to the
+sorted positions of the matching levels in a world/level ordered list, so the
+page filters by intersecting lists instead of scanning every level.
+Bucket keys are the option values used by the filter dropdowns.
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+from parse_overcooked_data import level_sort_key
+from json_output import write_json
+
+
+# Facets filtered by exact value
+VALUE_FACETS = ["start_at_go", "fixed_environment", "dish_washer", "composite_num"]
+
+# Inclusive "min-max" ranges, as offered by the Levels page dropdowns
+CHALLENGE_SCORE_BUCKETS = ["1-5", "6-10", "11-15", "16-20", "21-999"]
+ONE_STAR_SCORE_BUCKETS = ["0-100", "101-200", "201-300", "301-400", "401-500", "501-9999"]
+
+# Time to complete buckets in seconds: (exclusive low, inclusive high);
+# "1-3" also includes exactly 60 seconds
+TIME_BUCKETS = {
+    "1-3": (59, 180),
+    "3-5": (180, 300),
+    "5+": (300, math.inf),
+}
+
+
+def js_number(value):
+    """Mirror JavaScript Number(): '' -> 0, unparseable -> NaN"""
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    value_str = str(value).strip()
+    if value_str == "":
+        return 0.0
+    try:
+        return float(value_str)
+    except ValueError:
+        return math.nan
+
+
+def time_in_seconds(value):
+    """Parse 'm:ss' the way Levels.js does, None if it can't"""
+    if not isinstance(value, str) or ":" not in value:
+        return None
+    parts = value.split(":")
+    if len(parts) != 2:
+        return None
+    try:
+        return int(parts[0]) * 60 + int(parts[1])
+    except ValueError:
+        return None
+
+
+def range_bucket_positions(levels, field, buckets):
+    """Positions of levels whose numeric field falls inside each 'min-max' bucket"""
+    result = {bucket: [] for bucket in buckets}
+    bounds = {bucket: tuple(map(float, bucket.split("-"))) for bucket in buckets}
+    for position, level in enumerate(levels):
+        value = js_number(level.get(field))
+        for bucket, (low, high) in bounds.items():
+            if low <= value <= high:
+                result[bucket].append(position)
+    return result
+
+
+def build_facet_index(data):
+    """Return the facet index for a levels dict keyed by level name"""
+    level_keys = sorted(data, key=level_sort_key)
+    levels = [data[level_key] for level_key in level_keys]
+    facets = {}
+
+    for field in VALUE_FACETS:
+        values = {}
+        for position, level in enumerate(levels):
+            value = level.get(field)
+            if value is not None:
+                values.setdefault(str(value), []).append(position)
+        facets[field] = values
+
+    facets["challenge_score"] = range_bucket_positions(levels, "challenge_score", CHALLENGE_SCORE_BUCKETS)
+    facets["one_star_score"] = range_bucket_positions(levels, "one_star_score", ONE_STAR_SCORE_BUCKETS)
+
+    time_facet = {bucket: [] for bucket in TIME_BUCKETS}
+    for position, level in enumerate(levels):
+        seconds = time_in_seconds(level.get("time_to_complete"))
+        if seconds is None:
+            continue
+        for bucket, (low, high) in TIME_BUCKETS.items():
+            if low < seconds <= high:
+                time_facet[bucket].append(position)
+    facets["time_to_complete"] = time_facet
+
+    return {"levels": level_keys, "facets": facets}
+
+
+def index_path_for(output_file):
+    """Companion index path for a level JSON file"""
+    return Path(output_file).with_name("levels_index.json")
+
+
+def write_facet_index(data, index_file):
+    index = build_facet_index(data)
+    write_json(index_file, index, level_diff=False, separators=(",", ":"))
+    return index
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", nargs="?", default="public/levels_with_scores.json",
+                        help="level JSON to index (default: %(default)s)")
+    parser.add_argument("-o", "--output", help="index file (default: levels_index.json next to the input)")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    index_file = args.output or index_path_for(args.input)
+    index = write_facet_index(data, index_file)
+    print(f"✓ Indexed {len(index['levels'])} levels over {len(index['facets'])} facets")
+    print(f"✓ Index written to {index_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Single-pass build of public/levels_with_scores.json from the task analysis workbook.
+
+Loads the workbook once and runs field extraction, obstacle counting and
+challenge scoring as in-memory stages, replacing the chain of
+parse_overcooked_data.py -> add_obstacles_to_json.py -> add_challenge_score_to_json.py.
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from parse_overcooked_data import DEFAULT_MODE, PARSE_MODES, open_for_mode, parse_workbook, preserve_video_links
+from count_rows_under_string import collect_sections_in_workbook, open_values_workbook
+from add_obstacles_to_json import DEFAULT_SECTIONS, add_sections_to_levels, parse_section_spec
+from add_challenge_score_to_json import calculate_challenge_scores
+from challenge_score_engine import read_weights
+from build_facet_index import index_path_for, write_facet_index
+from build_similarity_index import similar_path_for, write_similarity_index
+from build_shards import shards_dir_for, write_shards
+from grid_snapshot import add_snapshot_arguments, open_snapshot, snapshot_dir_from_args
+from json_output import write_json
+from instrumentation import RunReport, add_logging_arguments, configure_from_args, get_logger, log_event
+
+
+logger = get_logger("build")
+
+
+OBSTACLE_SEARCH_STRING = "Obstacle Type"
+
+
+def build_levels(wb, mode=DEFAULT_MODE, stats=None, report=None, sections=None, weights=None,
+                 values_wb=None):
+    """
+    Run every build stage against an already loaded workbook.
+    sections: {header: (field, window)} counted in one scan, default DEFAULT_SECTIONS
+    weights: optional challenge score {term: weight} overrides
+    values_wb: the same workbook opened with open_values_workbook, read by
+    the section scan; defaults to wb, which must then hold cached values
+    """
+    sections = DEFAULT_SECTIONS if sections is None else sections
+    report = report or RunReport()
+
+    # Stage 1: field extraction from the World sheets
+    with report.stage("parse"):
+        parse_stats = {}
+        levels_data = parse_workbook(wb, mode=mode, stats=parse_stats)
+        report.count_all(parse_stats)
+
+    # Stage 2: obstacle and other section counts, one scan of the cached values
+    with report.stage("sections"):
+        scan_stats = {}
+        patterns = {header: window for header, (_, window) in sections.items()}
+        section_results = collect_sections_in_workbook(wb if values_wb is None else values_wb, patterns,
+                                                       stats=scan_stats)
+        add_sections_to_levels(levels_data, section_results, sections)
+        report.count_all(scan_stats)
+
+    # Stage 3: challenge scoring
+    with report.stage("score"):
+        calculate_challenge_scores(levels_data, weights)
+        report.count("levels", len(levels_data))
+
+    if stats is not None:
+        for stage_stats in (parse_stats, scan_stats):
+            for key, value in stage_stats.items():
+                stats[key] = stats.get(key, 0) + value
+
+    return levels_data
+
+
+def write_outputs(levels_data, output_file):
+    """
+    Write the level JSON and its companions (facet index, neighbours,
+    per-world shards). Returns {name: path}.
+    """
+    output_file = Path(output_file)
+    paths = {
+        "output": output_file,
+        "index": index_path_for(output_file),
+        "similar": similar_path_for(output_file),
+        "shards": shards_dir_for(output_file),
+    }
+    write_json(output_file, levels_data, indent=4)
+    write_facet_index(levels_data, paths["index"])
+    write_similarity_index(levels_data, paths["similar"])
+    write_shards(levels_data, paths["shards"])
+    return paths
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("excel_file", nargs="?", default="Overcooked 2 Full Task Analysis.xlsx",
+                        help="task analysis workbook (default: %(default)s)")
+    parser.add_argument("-o", "--output", default="public/levels_with_scores.json",
+                        help="output JSON file (default: %(default)s)")
+    parser.add_argument("--mode", choices=sorted(PARSE_MODES), default=DEFAULT_MODE,
+                        help="sheet parser used for field extraction (default: %(default)s)")
+    parser.add_argument("--section", action="append", default=[], metavar="HEADER=FIELD[:WINDOW]",
+                        help="also count the rows under section header HEADER into FIELD, "
+                             "e.g. 'Ingredient Type=num_ingredients:8' (repeatable)")
+    parser.add_argument("--weights", metavar="FILE",
+                        help="JSON file of challenge score {term: weight} overrides")
+    add_snapshot_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    report = configure_from_args(args)
+
+    try:
+        sections = dict(DEFAULT_SECTIONS)
+        sections.update(parse_section_spec(spec) for spec in args.section)
+        weights = read_weights(args.weights) if args.weights else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    excel_file = Path(args.excel_file)
+    output_file = Path(args.output)
+
+    if not excel_file.exists():
+        logger.error("File '%s' not found", excel_file)
+        return
+
+    # Load existing output to preserve video_link values
+    existing_data = {}
+    if output_file.exists():
+        with open(output_file, 'r', encoding='utf-8') as f:
+            existing_data = json.load(f)
+
+    snapshot_dir = snapshot_dir_from_args(args, excel_file)
+    with report.stage("load_workbook"):
+        if snapshot_dir is not None:
+            wb = open_snapshot(excel_file, snapshot_dir)
+        else:
+            wb = open_for_mode(excel_file, args.mode)
+        values_wb = open_values_workbook(excel_file, snapshot_dir)
+
+    try:
+        levels_data = build_levels(wb, mode=args.mode, report=report, sections=sections,
+                                   weights=weights, values_wb=values_wb)
+    finally:
+        wb.close()
+        values_wb.close()
+    preserve_video_links(levels_data, existing_data)
+
+    with report.stage("write"):
+        paths = write_outputs(levels_data, output_file)
+
+    log_event(logger, logging.INFO, "Build finished", levels=len(levels_data), **paths)
+    if args.report:
+        report.write(args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Split the level JSON into one shard per world plus a manifest, so the site
+can fetch and render each world on its own.
+
+    public/levels/world_1.json ... world_6.json
+    public/levels/world_1.json.gz, world_1.json.br ...
+    public/levels/manifest.json
+
+Shards are minified in the table layout of wire_format.py, so field names
+are sent once per shard rather than once per level. The manifest lists
+every shard's file, level keys, byte size, content hash and precompressed
+sizes. Clients can fetch only the worlds they display and cache each shard
+by its hash. The .gz variant is always written, the .br variant when the
+optional brotli package is installed.
+
+Levels from a batch_build.py catalog ("source:Level_1_1") are sharded per
+source and world, e.g. overcooked_2_world_1.json.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from parse_overcooked_data import level_sort_key
+from json_output import write_bytes, write_json
+from wire_format import COMPACT, PRECOMPRESSED_SUFFIXES, encode_table, precompressed
+
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+
+
+def shard_id_for(level_key):
+    """'Level_2_3' -> 'world_2'; 'overcooked_2:Level_2_3' -> 'overcooked_2_world_2'"""
+    source, _, key = level_key.rpartition(":")
+    world = level_sort_key(key)[0]
+    return f"{source}_world_{world}" if source else f"world_{world}"
+
+
+def build_shards(data):
+    """{shard id: {level key: level}}, shards and levels in world/level order"""
+    shards = {}
+    for level_key in sorted(data, key=lambda key: (key.rpartition(":")[0], level_sort_key(key))):
+        shards.setdefault(shard_id_for(level_key), {})[level_key] = data[level_key]
+    return shards
+
+
+def shards_dir_for(output_file):
+    """Shard directory for a level JSON file"""
+    return Path(output_file).with_name("levels")
+
+
+def write_shards(data, shard_dir):
+    """
+    Write each shard and its precompressed variants (only when changed) and
+    the manifest; shard files left over from worlds that no longer exist are
+    removed
+    """
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {"version": MANIFEST_VERSION, "format": "table", "shards": {}}
+    for shard_id, levels in build_shards(data).items():
+        shard_file = shard_dir / f"{shard_id}.json"
+        write_json(shard_file, encode_table(levels), level_diff=False, **COMPACT)
+        raw = shard_file.read_bytes()
+        variants = precompressed(raw)
+        for suffix in PRECOMPRESSED_SUFFIXES:
+            variant_file = shard_file.with_name(shard_file.name + suffix)
+            if suffix in variants:
+                write_bytes(variant_file, variants[suffix])
+            elif variant_file.exists():
+                # e.g. a .br left from a build with brotli installed; it would be stale
+                os.unlink(variant_file)
+        manifest["shards"][shard_id] = {
+            "file": shard_file.name,
+            "levels": list(levels),
+            "bytes": len(raw),
+            "sha256": hashlib.sha256(raw).hexdigest()[:16],
+            "compressed": {suffix.lstrip("."): len(blob) for suffix, blob in variants.items()},
+        }
+
+    previous = manifest_files(shard_dir / MANIFEST_FILE)
+    current = {entry["file"] for entry in manifest["shards"].values()}
+    for stale in previous - current:
+        for name in [stale] + [stale + suffix for suffix in PRECOMPRESSED_SUFFIXES]:
+            stale_path = shard_dir / name
+            if stale_path.exists():
+                os.unlink(stale_path)
+
+    write_json(shard_dir / MANIFEST_FILE, manifest, level_diff=False, indent=2)
+    return manifest
+
+
+def manifest_files(manifest_path):
+    """Shard file names listed in an existing manifest"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return {entry["file"] for entry in json.load(f)["shards"].values()}
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("levels_file", nargs="?", default="public/levels_with_scores.json",
+                        help="level JSON to shard (default: %(default)s)")
+    parser.add_argument("-o", "--output-dir", help="shard directory (default: levels/ next to the input)")
+    args = parser.parse_args()
+
+    with open(args.levels_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    shard_dir = Path(args.output_dir) if args.output_dir else shards_dir_for(args.levels_file)
+    manifest = write_shards(data, shard_dir)
+    print(f"✓ {len(manifest['shards'])} shards for {len(data)} levels written to {shard_dir}")
+
+
+if __name__ == "__main__":
+    main()
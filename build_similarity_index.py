@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Build the "levels like this one" neighbour lists.
+
+Every level becomes a row of a standardized feature matrix (station counts,
+tip multipliers, scores, time, yes/no flags); the k nearest levels by
+Euclidean distance are found with blocked matrix products, so a block of
+levels is compared against all levels at once. The result is written
+minified next to the level JSON:
+
+    {"k": 5, "features": [...], "keys": ["Level_1_1", ...],
+     "neighbours": {"Level_1_1": [positions in keys, nearest first]},
+     "distances": {"Level_1_1": [...]}}
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from parse_overcooked_data import level_sort_key
+from level_store import load_records
+from json_output import write_json
+
+
+# Features compared between levels
+NUMERIC_FEATURES = [
+    "composite_num",
+    "variation_num",
+    "num_obstacles",
+    "num_dishes",
+    "num_chopping_boards",
+    "num_ovens",
+    "num_stove_tops",
+    "num_mixers",
+    "tip_multiplier_x1",
+    "tip_multiplier_x2",
+    "tip_multiplier_x3",
+    "one_star_score",
+    "challenge_score",
+    "time_to_complete",     # "m:ss" compared in seconds
+]
+YES_NO_FEATURES = ["start_at_go", "fixed_environment", "recipe_order_fixed", "dish_washer"]
+
+DEFAULT_K = 5
+# Levels compared per matrix product; bounds the distance block to BLOCK_SIZE x levels
+BLOCK_SIZE = 1024
+
+
+def feature_value(value):
+    """Float for a typed record value (yes/no as 1/0, times in seconds), NaN when missing or not a number"""
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    return math.nan
+
+
+def feature_matrix(data, features=None):
+    """
+    (level keys in world/level order, standardized float matrix levels x features).
+    Missing values take the feature's mean, i.e. 0 after standardizing;
+    constant features contribute nothing.
+    """
+    features = features or NUMERIC_FEATURES + YES_NO_FEATURES
+    keys = sorted(data, key=level_sort_key)
+    records = load_records({key: data[key] for key in keys})
+    matrix = np.array([[feature_value(record.get(feature)) for feature in features] for record in records],
+                      dtype=np.float64).reshape(len(keys), len(features))
+
+    with np.errstate(invalid="ignore"):
+        mean = np.nanmean(matrix, axis=0) if len(keys) else np.zeros(len(features))
+        std = np.nanstd(matrix, axis=0) if len(keys) else np.ones(len(features))
+    mean = np.nan_to_num(mean)
+    std = np.where(np.isnan(std) | (std == 0), 1.0, std)
+    standardized = (matrix - mean) / std
+    return keys, np.nan_to_num(standardized, nan=0.0)
+
+
+def nearest_neighbours(matrix, k=DEFAULT_K, block_size=BLOCK_SIZE):
+    """
+    Indices (levels x k, nearest first; ties by position) and Euclidean
+    distances of every row's k nearest other rows, computed block by block as
+    |a|^2 + |b|^2 - 2ab
+    """
+    n = matrix.shape[0]
+    k = min(k, max(n - 1, 0))
+    indices = np.empty((n, k), dtype=np.int32)
+    distances = np.empty((n, k), dtype=np.float64)
+    if k == 0:
+        return indices, distances
+
+    sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = matrix[start:stop]
+        d2 = sq_norms[start:stop, None] + sq_norms[None, :] - 2.0 * (block @ matrix.T)
+        np.maximum(d2, 0.0, out=d2)
+        # A level is not its own neighbour
+        d2[np.arange(stop - start), np.arange(start, stop)] = np.inf
+
+        # Candidates: everything within the k-th smallest distance, ties included
+        kth = np.partition(d2, k - 1, axis=1)[:, k - 1:k]
+        for row in range(stop - start):
+            candidates = np.flatnonzero(d2[row] <= kth[row])
+            order = candidates[np.lexsort((candidates, d2[row, candidates]))][:k]
+            indices[start + row] = order
+            distances[start + row] = np.sqrt(d2[row, order])
+
+    return indices, distances
+
+
+def build_similarity_index(data, k=DEFAULT_K, features=None):
+    features = features or NUMERIC_FEATURES + YES_NO_FEATURES
+    keys, matrix = feature_matrix(data, features)
+    indices, distances = nearest_neighbours(matrix, k)
+    return {
+        "k": int(indices.shape[1]),
+        "features": features,
+        "keys": keys,
+        "neighbours": {key: indices[i].tolist() for i, key in enumerate(keys)},
+        "distances": {key: np.round(distances[i], 3).tolist() for i, key in enumerate(keys)},
+    }
+
+
+def similar_path_for(output_file):
+    """Companion neighbours path for a level JSON file"""
+    return Path(output_file).with_name("levels_similar.json")
+
+
+def write_similarity_index(data, similar_file, k=DEFAULT_K):
+    index = build_similarity_index(data, k)
+    write_json(similar_file, index, level_diff=False, separators=(",", ":"))
+    return index
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("levels_file", nargs="?", default="public/levels_with_scores.json",
+                        help="level JSON to index (default: %(default)s)")
+    parser.add_argument("-o", "--output", help="neighbours file (default: levels_similar.json next to the input)")
+    parser.add_argument("-k", type=int, default=DEFAULT_K, help="neighbours per level (default: %(default)s)")
+    args = parser.parse_args()
+
+    with open(args.levels_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    similar_file = Path(args.output) if args.output else similar_path_for(args.levels_file)
+    index = write_similarity_index(data, similar_file, args.k)
+    print(f"✓ {index['k']} neighbours for {len(index['keys'])} levels written to {similar_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Vectorized challenge score calculation.
+
+Levels are converted once into a typed NumPy term matrix (one row per level,
+one column per term of the challenge formula); scores for one weight vector,
+or a whole matrix of candidate weight vectors, are then a single matrix product.
+"""
+
+import json
+
+import numpy as np
+
+
+# Terms of the challenge formula, in the order they are summed
+SCORE_TERMS = (
+    "start_at_go",
+    "one_star_score",      # round(one_star_score / 100)
+    "dish_washer",
+    "composite_num",
+    "variation_num",
+    "variation_extra",     # variation_num again if variations change atomic challenges
+    "num_obstacles",
+    "fixed_environment",
+    "fixed_env_extra",     # 1 if the environment and the recipe order are both fixed
+)
+
+# Weights of the published challenge score
+DEFAULT_WEIGHTS = {
+    "start_at_go": 1,
+    "one_star_score": 1,
+    "dish_washer": 1,
+    "composite_num": 2,
+    "variation_num": 1,
+    "variation_extra": 1,
+    "num_obstacles": 1,
+    "fixed_environment": 1,
+    "fixed_env_extra": 1,
+}
+
+
+class LevelColumns:
+    """Challenge formula terms for a set of levels as a (levels x terms) float matrix"""
+
+    def __init__(self, level_keys, terms):
+        self.level_keys = list(level_keys)
+        self.terms = terms
+
+    @classmethod
+    def from_records(cls, records):
+        """Build the term matrix from typed level_store.LevelRecords, no string parsing"""
+        rows = []
+        for r in records:
+            fixed_environment = float(bool(r.fixed_environment))
+            variation_num = float(r.variation_num or 0)
+            rows.append((
+                float(bool(r.start_at_go)),
+                round((r.one_star_score or 0) / 100, 0),
+                float(bool(r.dish_washer)),
+                float(r.composite_num or 0),
+                variation_num,
+                variation_num if r.extra.get('variation_changes_atomic', False) else 0.0,
+                float(r.num_obstacles or 0),
+                fixed_environment,
+                fixed_environment * bool(r.recipe_order_fixed),
+            ))
+        terms = np.array(rows, dtype=float).reshape(len(rows), len(SCORE_TERMS))
+        return cls([r.level_key for r in records], terms)
+
+    def __len__(self):
+        return len(self.level_keys)
+
+
+def weight_vector(weights=None):
+    """Return a weight vector in SCORE_TERMS order; missing terms use DEFAULT_WEIGHTS"""
+    merged = dict(DEFAULT_WEIGHTS)
+    if weights:
+        unknown = set(weights) - set(SCORE_TERMS)
+        if unknown:
+            raise ValueError(f"Unknown score terms: {sorted(unknown)}")
+        merged.update(weights)
+    return np.array([merged[term] for term in SCORE_TERMS], dtype=float)
+
+
+def read_weights(path):
+    """Load {term: weight} overrides from a JSON file; raises ValueError for unknown terms"""
+    with open(path, 'r', encoding='utf-8') as f:
+        weights = json.load(f)
+    if not isinstance(weights, dict):
+        raise ValueError(f"{path}: expected a JSON object of {{term: weight}}")
+    weight_vector(weights)
+    return weights
+
+
+def score_levels(columns, weights=None):
+    """Score every level with one weight dict (default: the published formula)"""
+    return columns.terms @ weight_vector(weights)
+
+
+def score_weight_matrix(columns, weight_matrix):
+    """
+    Score every level under many candidate weightings at once.
+    weight_matrix: (candidates x len(SCORE_TERMS)) array
+    Returns a (candidates x levels) array of scores.
+    """
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+    if weight_matrix.shape[1] != len(SCORE_TERMS):
+        raise ValueError(f"Expected {len(SCORE_TERMS)} weights per candidate, got {weight_matrix.shape[1]}")
+    return weight_matrix @ columns.terms.T
@@ -1,61 +1,211 @@
-import pandas as pd
-
-def collect_all_occurrences_combined(file_path, search_string):
-    xls = pd.ExcelFile(file_path)
-    
-    combined_results = {}   # <-- ONE dictionary for all sheets
-
-    for sheet_name in xls.sheet_names:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-
-        for row in range(df.shape[0]):
-            for col in range(df.shape[1]):
-
-                cell_value = df.iat[row, col]
-
-                # Ignore empty cells
-                if pd.isna(cell_value):
-                    continue
-
-                # Check for match
-                if str(cell_value).strip() == search_string:
-
-                    # Column header / first cell in this column
-                    column_key = df.iat[0, col]
-                    if pd.isna(column_key):
-                        column_key = f"col_{col}"   # fallback header
+import argparse
 
-                    # Extract the 5 rows below
-                    start_row = row + 1
-                    five_rows = df.iloc[start_row:start_row + 5, col]
-
-                    # Count non-empty rows
-                    non_empty_count = five_rows.apply(
-                        lambda x: not pd.isna(x) and str(x).strip() != ""
-                    ).sum()
-
-                    # If the header hasn't appeared yet, create a list
-                    if column_key not in combined_results:
-                        combined_results[column_key] = []
-
-                    # Add an occurrence item
-                    combined_results[column_key].append({
-                        "sheet": sheet_name,         # which sheet it came from
-                        "found_at": (row, col),
-                        "five_rows": five_rows.tolist(),
-                        "non_empty_count": int(non_empty_count)
-                    })
+import numpy as np
+import pandas as pd
 
+from instrumentation import get_logger
+from grid_snapshot import GridSheet, GridWorkbook, open_snapshot
+from xlsx_reader import open_workbook
+
+
+logger = get_logger("count_rows")
+
+
+# Number of rows under each match that are checked for non-empty cells
+DEFAULT_WINDOW = 5
+
+
+def rows_to_grid(rows):
+    """Convert a list of row sequences (ragged allowed) to a 2D object array"""
+    width = max((len(row) for row in rows), default=0)
+    grid = np.full((len(rows), width), None, dtype=object)
+    for i, row in enumerate(rows):
+        grid[i, :len(row)] = row
+    return grid
+
+
+def find_sections_in_grid(grid, sheet_name, patterns, section_results, stats=None):
+    """
+    grid: 2D object array for one sheet, row 0 being the header row
+    patterns: {header text: window}, the section headers to look for and how
+    many rows under each to check for non-empty cells
+    section_results: {header text: combined_results}, updated in place
+
+    Every pattern is found in the same pass: cells are stringified once, each
+    distinct string (hashed, not sorted) is looked up once, and window counts
+    for all matches come from one running count, so the cost does not grow
+    with len(patterns).
+    A stats dict gets rows_scanned/cells_scanned added.
+    """
+    if stats is not None:
+        stats['rows_scanned'] = stats.get('rows_scanned', 0) + grid.shape[0]
+        stats['cells_scanned'] = stats.get('cells_scanned', 0) + grid.size
+
+    for pattern in patterns:
+        section_results.setdefault(pattern, {})
+    if grid.size == 0 or not patterns:
+        return section_results
+
+    # Stringify and strip every cell once
+    empty = pd.isna(grid)
+    text = np.char.strip(np.where(empty, "", grid).astype(str))
+    non_empty = ~empty & (text != "")
+
+    # Pattern id per cell (-1 for no pattern) through the distinct strings
+    pattern_names = list(patterns)
+    pattern_ids = {pattern: i for i, pattern in enumerate(pattern_names)}
+    inverse, distinct = pd.factorize(text.ravel())
+    lookup = np.array([pattern_ids.get(value, -1) for value in distinct.tolist()], dtype=np.int64)
+    cell_pattern = lookup[inverse.reshape(text.shape)]
+    cell_pattern[~non_empty] = -1
+
+    # All matches in row-major order
+    hits = np.argwhere(cell_pattern >= 0)
+    if len(hits) == 0:
+        return section_results
+
+    # Window counts for every match from a running count down each column
+    n_rows = grid.shape[0]
+    running = np.zeros((n_rows + 1, grid.shape[1]), dtype=np.int64)
+    np.cumsum(non_empty, axis=0, out=running[1:])
+    rows, cols = hits[:, 0], hits[:, 1]
+    hit_patterns = cell_pattern[rows, cols]
+    windows = np.array([patterns[pattern] for pattern in pattern_names], dtype=np.int64)
+    starts = rows + 1
+    stops = np.minimum(starts + windows[hit_patterns], n_rows)
+    counts = running[stops, cols] - running[starts, cols]
+
+    for row, col, pattern_id, start, stop, count in zip(rows.tolist(), cols.tolist(), hit_patterns.tolist(),
+                                                        starts.tolist(), stops.tolist(), counts.tolist()):
+        # Column header / first cell in this column
+        column_key = grid[0, col]
+        if empty[0, col]:
+            column_key = f"col_{col}"   # fallback header
+
+        section_results[pattern_names[pattern_id]].setdefault(column_key, []).append({
+            "sheet": sheet_name,         # which sheet it came from
+            "found_at": (row, col),
+            "five_rows": grid[start:stop, col].tolist(),
+            "non_empty_count": int(count)
+        })
+
+    return section_results
+
+
+def find_occurrences_in_grid(grid, sheet_name, search_string, combined_results, window=DEFAULT_WINDOW,
+                             stats=None):
+    """
+    grid: 2D object array for one sheet, row 0 being the header row
+    Adds every cell matching search_string to combined_results, keyed by the
+    first cell of its column, with the number of non-empty cells in the
+    `window` rows below it. A stats dict gets rows_scanned/cells_scanned added.
+    """
+    find_sections_in_grid(grid, sheet_name, {search_string: window}, {search_string: combined_results}, stats)
     return combined_results
 
 
-
-# --------------------
-# Example Use
-# --------------------
-file_path = "C:\\Users\\roser\\Documents\\coding-projects\\overcooked-website\\React-Version\\overcooked-lvl-selector-react\\Overcooked 2 Full Task Analysis.xlsx"
-search_string = "Obstacle Type"
-
-output = collect_all_occurrences_combined(file_path, search_string)
-
-print(output)
+def iter_sheet_grids(xls, sheet_names=None):
+    """
+    Yield (sheet_name, grid) for each sheet of an open pd.ExcelFile.
+    The archive is decoded once by the handle; sheet_names limits reading to
+    the given sheets, in that order.
+    """
+    if sheet_names is None:
+        sheet_names = xls.sheet_names
+
+    for sheet_name in sheet_names:
+        if sheet_name not in xls.sheet_names:
+            logger.warning("Sheet '%s' not found, skipping", sheet_name)
+            continue
+        df = xls.parse(sheet_name, header=None)
+        yield sheet_name, df.to_numpy(dtype=object)
+
+
+def iter_workbook_grids(wb, sheet_names=None):
+    """Yield (sheet_name, grid) for each sheet of a loaded openpyxl workbook or GridWorkbook"""
+    sheets = wb.worksheets if sheet_names is None else [wb[name] for name in sheet_names if name in wb.sheetnames]
+    for sheet in sheets:
+        if isinstance(sheet, GridSheet):
+            yield sheet.title, sheet.grid()
+        else:
+            yield sheet.title, rows_to_grid(list(sheet.iter_rows(values_only=True)))
+
+
+def collect_sections_combined(file_path, patterns, sheet_names=None, stats=None):
+    """
+    One pass over each sheet for every section header in patterns ({header text: window}).
+    file_path: path to the workbook, an already open pd.ExcelFile, or a
+    GridWorkbook snapshot
+    Returns {header text: combined_results}.
+    """
+    if isinstance(file_path, GridWorkbook):
+        return collect_sections_in_workbook(file_path, patterns, sheet_names, stats)
+
+    xls = file_path if isinstance(file_path, pd.ExcelFile) else pd.ExcelFile(file_path)
+
+    section_results = {pattern: {} for pattern in patterns}
+    try:
+        for sheet_name, grid in iter_sheet_grids(xls, sheet_names):
+            find_sections_in_grid(grid, sheet_name, patterns, section_results, stats)
+    finally:
+        if xls is not file_path:
+            xls.close()
+
+    return section_results
+
+
+def open_values_workbook(filepath, snapshot_dir=None):
+    """
+    Read-only workbook (or grid snapshot) of the values Excel cached for
+    formulas, which is what collect_sections_combined reads through pandas.
+    A formula whose cached value is "" then counts as empty.
+    """
+    if snapshot_dir is not None:
+        return open_snapshot(filepath, snapshot_dir, data_only=True)
+    return open_workbook(filepath, read_only=True, data_only=True)
+
+
+def collect_sections_in_workbook(wb, patterns, sheet_names=None, stats=None):
+    """
+    Same as collect_sections_combined for an already loaded openpyxl workbook
+    or GridWorkbook; open it with open_values_workbook for the same counts
+    """
+    section_results = {pattern: {} for pattern in patterns}
+    for sheet_name, grid in iter_workbook_grids(wb, sheet_names):
+        find_sections_in_grid(grid, sheet_name, patterns, section_results, stats)
+    return section_results
+
+
+def collect_all_occurrences_combined(file_path, search_string, window=DEFAULT_WINDOW, sheet_names=None,
+                                     stats=None):
+    """
+    file_path: path to the workbook, an already open pd.ExcelFile, or a
+    GridWorkbook snapshot
+    sheet_names: optional list of sheets to search (default: all sheets)
+    """
+    return collect_sections_combined(file_path, {search_string: window}, sheet_names, stats)[search_string]
+
+
+def collect_all_occurrences_in_workbook(wb, search_string, window=DEFAULT_WINDOW, sheet_names=None,
+                                        stats=None):
+    """Same as collect_all_occurrences_combined for an already loaded openpyxl workbook or GridWorkbook"""
+    return collect_sections_in_workbook(wb, {search_string: window}, sheet_names, stats)[search_string]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Count non-empty rows under a section header in every sheet")
+    parser.add_argument("excel_file", nargs="?", default="Overcooked 2 Full Task Analysis.xlsx",
+                        help="task analysis workbook (default: %(default)s)")
+    parser.add_argument("--search", default="Obstacle Type", help="section header (default: %(default)s)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW,
+                        help="rows counted under each header (default: %(default)s)")
+    args = parser.parse_args()
+
+    output = collect_all_occurrences_combined(args.excel_file, args.search, args.window)
+
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
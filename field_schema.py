@@ -0,0 +1,214 @@
+"""
+Declarative schema of the level fields read from the World sheets.
+
+Each FieldSpec names a JSON key, the Excel label it is read from, its kind,
+its default and an optional zero-fill rule. compile_schema() turns the
+schema into the tables the sheet parsers use: Excel label -> JSON key, a
+dispatch table of per-label setter functions specialized by kind, the
+default level dict and the post-parse zero-fill rules. Adding a field is
+one FieldSpec line.
+"""
+
+import re
+from datetime import time
+from typing import NamedTuple, Optional
+
+
+class FieldSpec(NamedTuple):
+    name: str                           # JSON key
+    label: Optional[str]                # Excel field label, None if not read from the sheet
+    kind: str                           # key of CLEANERS
+    default: str = ""
+    zero_if_no: Optional[str] = None    # yes/no field; "no" there means this count is "0"
+
+
+# Level fields in the order they appear in Excel and in the level JSON
+SCHEMA = [
+    FieldSpec("time_to_complete", "Level Time (mm:ss)", "time"),                           # Row 15
+    FieldSpec("start_at_go", "Does Clock start at \"Go\" ?", "yes_no"),                   # Row 16
+    FieldSpec("one_star_score", "Score for 1 Star (2 Players)", "number"),                 # Row 17
+    FieldSpec("points_composite_1", "Points given for completing Composite Challenge 1", "number"),  # Row 18
+    FieldSpec("points_composite_2", "Points given for completing Composite Challenge 2", "number"),  # Row 19
+    FieldSpec("tip_multiplier_x1", "Tip Multiplier (x1)", "number"),                       # Row 20
+    FieldSpec("tip_multiplier_x2", "Tip Multiplier (x2)", "number"),                       # Row 21
+    FieldSpec("tip_multiplier_x3", "Tip Multiplier (x3)", "number"),                       # Row 22
+    FieldSpec("fixed_environment", "Is Environment Fixed?", "yes_no"),                     # Row 25
+    FieldSpec("recipe_order_fixed", "Is Recipe (Composite Challenge) Order Fixed?", "yes_no"),       # Row 26
+    # "1 (2 variations)" sets both composite_num and variation_num
+    FieldSpec("composite_num", "Number of Recipes", "recipes"),                            # Row 27
+    FieldSpec("variation_num", None, "derived"),                                           # Row 27
+    FieldSpec("dish_washer", "Dish Washer?", "yes_no"),                                    # Row 28
+    FieldSpec("num_dishes", "Number of Dishes", "number"),                                 # Row 29
+    FieldSpec("has_chopping_board", "Chopping Board?", "yes_no"),                          # Row 30
+    FieldSpec("num_chopping_boards", "Number of Chopping Boards", "number",                # Row 31
+              zero_if_no="has_chopping_board"),
+    FieldSpec("has_oven", "Oven?", "yes_no"),                                              # Row 32
+    FieldSpec("num_ovens", "Number of Ovens", "number", zero_if_no="has_oven"),            # Row 33
+    FieldSpec("has_stove_tops", "Stove-Tops?", "yes_no"),                                  # Row 34
+    FieldSpec("num_stove_tops", "Number of Stove-Tops?", "number", zero_if_no="has_stove_tops"),     # Row 35
+    FieldSpec("has_mixers", "Mixers?", "yes_no"),                                          # Row 36
+    FieldSpec("num_mixers", "Number of Mixers?", "number", zero_if_no="has_mixers"),       # Row 37
+    FieldSpec("num_completed_composite_for_star",                                          # Row 60
+              "Number of Completed Composite Challenges needed to achieve 1 Star (2 Players)", "number"),
+    FieldSpec("penalty_failed_composite", "Penalty for failing a Composite Challenge", "text"),       # Row 61
+    FieldSpec("challenge_score", "Challenge Score", "number"),                             # Row 64
+    FieldSpec("additional_notes", "Additional Notes", "text"),                             # Row 66
+    FieldSpec("video_link", None, "manual"),                                               # Not in Excel
+]
+
+
+# Compiled once instead of per cell
+LEVEL_HEADER_RE = re.compile(r'^Level (\d+\.\d+)$', re.IGNORECASE)
+EXCEL_TIME_RE = re.compile(r'^(\d+):(\d+):(\d+)$')
+MMSS_RE = re.compile(r'^\d+:\d{2}$')
+RECIPES_RE = re.compile(r'^(\d+)\s*\((\d+)\s*variations?\)$', re.IGNORECASE)
+
+YES_NO_VALUES = {"yes": "yes", "y": "yes", "no": "no", "n": "no"}
+
+
+def convert_time_to_mmss(value):
+    """Convert Excel time format to mm:ss"""
+    if value is None:
+        return "manual-input-needed"
+
+    # If it's already a datetime.time object from Excel
+    if isinstance(value, time):
+        # Excel stores time as HH:MM:SS where HH=minutes, MM=seconds for game time
+        minutes = value.hour
+        seconds = value.minute
+        return f"{minutes}:{seconds:02d}"
+
+    # If it's a string
+    value_str = str(value).strip()
+
+    # Try to parse HH:MM:SS format (Excel format where HH=minutes, MM=seconds)
+    time_match = EXCEL_TIME_RE.match(value_str)
+    if time_match:
+        hours, mins, secs = map(int, time_match.groups())
+        # Hours field represents minutes, minutes field represents seconds
+        minutes = hours
+        seconds = mins
+        return f"{minutes}:{seconds:02d}"
+
+    # Try mm:ss format (already correct)
+    if MMSS_RE.match(value_str):
+        return value_str
+
+    return "manual-input-needed"
+
+
+def parse_number_of_recipes(value):
+    """Parse 'Number of Recipes' which might be '1 (2 variations)' or just '1.0'"""
+    if value is None or str(value).strip() == "":
+        return None, None
+
+    value_str = str(value).strip()
+
+    # Check for pattern like "1 (2 variations)"
+    match = RECIPES_RE.match(value_str)
+    if match:
+        composite = match.group(1)
+        variations = match.group(2)
+        return composite, variations
+
+    # Otherwise just a number
+    try:
+        num = float(value_str)
+        if num.is_integer():
+            return str(int(num)), None
+        return str(num), None
+    except (ValueError, AttributeError):
+        return None, None
+
+
+# Cleaners take a raw cell value and its stripped, non-empty string form and
+# return the JSON string, or None if the value is invalid
+
+def clean_time(value, value_str):
+    result = convert_time_to_mmss(value)
+    return None if result == "manual-input-needed" else result
+
+
+def clean_yes_no(value, value_str):
+    return YES_NO_VALUES.get(value_str.lower())
+
+
+def clean_number(value, value_str):
+    # Skip "NA" values
+    if value_str.upper() == "NA":
+        return None
+    try:
+        num_val = float(value_str)
+        if num_val.is_integer():
+            return str(int(num_val))
+        return str(num_val)
+    except (ValueError, AttributeError):
+        return None
+
+
+def clean_text(value, value_str):
+    return value_str
+
+
+CLEANERS = {
+    "time": clean_time,
+    "yes_no": clean_yes_no,
+    "number": clean_number,
+    "text": clean_text,
+    # Values of fields without a plain cell of their own
+    "recipes": clean_number,
+    "derived": clean_number,
+    "manual": clean_text,
+}
+
+
+def make_setter(spec):
+    """Specialized (level_data, raw value) -> cleaned value or None setter for one sheet field"""
+    name = spec.name
+
+    if spec.kind == "recipes":
+        def set_recipes(level_data, value):
+            composite, variations = parse_number_of_recipes(value)
+            if composite:
+                level_data[name] = composite
+            if variations:
+                level_data["variation_num"] = variations
+            return composite
+
+        return set_recipes
+
+    clean = CLEANERS[spec.kind]
+
+    def set_field(level_data, value):
+        if value is None:
+            level_data[name] = ""
+            return None
+        value_str = str(value).strip()
+        cleaned = clean(value, value_str) if value_str else None
+        # Set value (empty string if None)
+        level_data[name] = "" if cleaned is None else cleaned
+        return cleaned
+
+    return set_field
+
+
+class CompiledSchema(NamedTuple):
+    field_mapping: dict     # Excel label -> JSON key
+    setters: dict           # Excel label -> setter
+    cleaners: dict          # JSON key -> cleaner
+    default_level: dict     # template for new level dicts
+    zero_fill: list         # (yes/no field, count field) pairs
+
+
+def compile_schema(schema=SCHEMA):
+    read = [spec for spec in schema if spec.label is not None]
+    return CompiledSchema(
+        field_mapping={spec.label: spec.name for spec in read},
+        setters={spec.label: make_setter(spec) for spec in read},
+        cleaners={spec.name: CLEANERS[spec.kind] for spec in schema},
+        default_level={spec.name: spec.default for spec in schema},
+        zero_fill=[(spec.zero_if_no, spec.name) for spec in schema if spec.zero_if_no],
+    )
+
+
+COMPILED = compile_schema()
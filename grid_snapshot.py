@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Decoded-grid snapshot of a workbook, shared by the parse, obstacle count and
+inspect tools so the xlsx is decoded once per change rather than once per run.
+
+A snapshot directory holds, for each sheet, an int32 .npy grid of value
+codes (memory-mapped when loaded) as openpyxl reads it by default, with
+formulas as written, and a second grid of the values Excel cached for the
+formulas (data_only, as pandas reads them) when the two differ. values.json
+is the table of distinct cell values those codes index (code 0 is an empty
+cell) and meta.json holds the sheet shapes and the workbook's size, mtime
+and SHA-256. A snapshot is
+rebuilt when the workbook's content hash no longer matches; an unchanged
+mtime and size skip hashing.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from instrumentation import get_logger
+from xlsx_reader import open_workbook
+
+
+logger = get_logger("snapshot")
+
+
+SNAPSHOT_VERSION = 2
+DEFAULT_SNAPSHOT_ROOT = ".grid_snapshot"
+META_FILE = "meta.json"
+VALUES_FILE = "values.json"
+
+# Cell value types that JSON cannot hold directly, tagged in values.json
+_TEMPORAL_TYPES = {
+    "datetime": datetime.datetime,
+    "date": datetime.date,
+    "time": datetime.time,
+}
+
+
+def encode_value(value):
+    """JSON form of a cell value for values.json"""
+    if isinstance(value, datetime.timedelta):
+        return {"timedelta": value.total_seconds()}
+    # datetime before date: datetime is a date subclass
+    for tag, kind in _TEMPORAL_TYPES.items():
+        if isinstance(value, kind):
+            return {tag: value.isoformat()}
+    return value
+
+
+def decode_value(value):
+    """Inverse of encode_value"""
+    if isinstance(value, dict):
+        (tag, raw), = value.items()
+        if tag == "timedelta":
+            return datetime.timedelta(seconds=raw)
+        return _TEMPORAL_TYPES[tag].fromisoformat(raw)
+    return value
+
+
+def file_sha256(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(filepath, sha256=None):
+    stat = os.stat(filepath)
+    return {
+        "path": str(filepath),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256 or file_sha256(filepath),
+    }
+
+
+def snapshot_dir_for(filepath, root=DEFAULT_SNAPSHOT_ROOT):
+    """Default snapshot directory of a workbook: <root>/<workbook file name>"""
+    return Path(root) / Path(filepath).name
+
+
+class GridCell:
+    """Stand-in for an openpyxl cell; only .value is supported"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class GridSheet:
+    """
+    One decoded sheet. Supports the worksheet calls the build scripts make:
+    iter_rows(values_only=True), cell(row, column).value, max_row/max_column
+    and grid() for the whole sheet as an object array.
+    """
+
+    def __init__(self, title, codes, values):
+        self.title = title
+        self.codes = codes
+        self.values = values
+
+    @property
+    def max_row(self):
+        return self.codes.shape[0]
+
+    @property
+    def max_column(self):
+        return self.codes.shape[1]
+
+    def grid(self, min_row=1, max_row=None, min_col=1, max_col=None):
+        """Decoded values of a 1-based inclusive range as a 2D object array, padded with None"""
+        max_row = self.max_row if max_row is None else max_row
+        max_col = self.max_column if max_col is None else max_col
+        block = self.values[self.codes[min_row - 1:max_row, min_col - 1:max_col]]
+        missing_cols = (max_col - min_col + 1) - block.shape[1]
+        if missing_cols > 0:
+            block = np.hstack([block, np.full((block.shape[0], missing_cols), None, dtype=object)])
+        return block
+
+    def iter_rows(self, min_row=1, max_row=None, min_col=1, max_col=None, values_only=True):
+        if not values_only:
+            raise ValueError("GridSheet only supports iter_rows(values_only=True)")
+        max_row = self.max_row if max_row is None else min(max_row, self.max_row)
+        for row in self.grid(min_row, max_row, min_col, max_col).tolist():
+            yield tuple(row)
+
+    def cell(self, row, column):
+        if row > self.max_row or column > self.max_column:
+            return GridCell(None)
+        return GridCell(self.values[self.codes[row - 1, column - 1]])
+
+
+class GridWorkbook:
+    """Loaded snapshot with the sheetnames / wb[name] / worksheets interface of a workbook"""
+
+    def __init__(self, directory, meta, sheets):
+        self.directory = Path(directory)
+        self.meta = meta
+        self._sheets = sheets
+
+    @property
+    def sheetnames(self):
+        return list(self._sheets)
+
+    @property
+    def worksheets(self):
+        return list(self._sheets.values())
+
+    def __getitem__(self, name):
+        return self._sheets[name]
+
+    def __contains__(self, name):
+        return name in self._sheets
+
+    def close(self):
+        # Drops the memory maps once nothing else references them
+        self._sheets = {}
+
+
+def encode_sheet(sheet, codes_by_value, values):
+    """Decode a worksheet into an int32 grid of value codes, extending the value table"""
+    rows = []
+    width = 0
+    for row in sheet.iter_rows(values_only=True):
+        row_codes = []
+        for value in row:
+            if value is None:
+                row_codes.append(0)
+                continue
+            # Type in the key keeps 1, 1.0 and True apart
+            key = (type(value), value)
+            code = codes_by_value.get(key)
+            if code is None:
+                code = codes_by_value[key] = len(values)
+                values.append(value)
+            row_codes.append(code)
+        rows.append(row_codes)
+        width = max(width, len(row_codes))
+
+    codes = np.zeros((len(rows), width), dtype=np.int32)
+    for i, row_codes in enumerate(rows):
+        codes[i, :len(row_codes)] = row_codes
+    return codes
+
+
+def build_snapshot(filepath, directory=None, sha256=None, data_only=False):
+    """
+    Decode every sheet of a workbook into a snapshot directory and return it
+    loaded, with cached formula values if data_only
+    """
+    directory = Path(directory or snapshot_dir_for(filepath))
+    fingerprint = source_fingerprint(filepath, sha256)
+
+    wb = open_workbook(filepath, read_only=True)
+    values_wb = open_workbook(filepath, read_only=True, data_only=True)
+    codes_by_value = {}
+    values = [None]
+    sheets = []
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=directory.parent))
+    try:
+        for i, sheet_name in enumerate(wb.sheetnames):
+            codes = encode_sheet(wb[sheet_name], codes_by_value, values)
+            file_name = f"sheet_{i}.npy"
+            np.save(tmp_dir / file_name, codes)
+
+            # Sheets without formulas share one grid for both views
+            data_codes = encode_sheet(values_wb[sheet_name], codes_by_value, values)
+            data_file_name = file_name
+            if not np.array_equal(codes, data_codes):
+                data_file_name = f"sheet_{i}_data.npy"
+                np.save(tmp_dir / data_file_name, data_codes)
+            sheets.append({"name": sheet_name, "file": file_name, "data_file": data_file_name,
+                           "shape": list(codes.shape)})
+
+        with open(tmp_dir / VALUES_FILE, 'w', encoding='utf-8') as f:
+            json.dump([encode_value(value) for value in values], f, ensure_ascii=False)
+        meta = {"version": SNAPSHOT_VERSION, "source": fingerprint, "sheets": sheets}
+        with open(tmp_dir / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        if directory.exists():
+            shutil.rmtree(directory)
+        os.replace(tmp_dir, directory)
+    finally:
+        wb.close()
+        values_wb.close()
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+
+    logger.info("Snapshot of %s written to %s (%d sheets, %d distinct values)",
+                filepath, directory, len(sheets), len(values) - 1)
+    return load_snapshot(directory, data_only)
+
+
+def read_meta(directory):
+    """meta.json of a snapshot, or None if there is no readable snapshot of this version"""
+    try:
+        with open(Path(directory) / META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == SNAPSHOT_VERSION else None
+
+
+def load_snapshot(directory, data_only=False):
+    """
+    Load a snapshot; sheet grids are memory-mapped rather than read.
+    data_only=True gives the cached formula values, like open_workbook's.
+    """
+    directory = Path(directory)
+    meta = read_meta(directory)
+    if meta is None:
+        raise FileNotFoundError(f"No snapshot in {directory}")
+
+    with open(directory / VALUES_FILE, 'r', encoding='utf-8') as f:
+        raw_values = json.load(f)
+    values = np.empty(len(raw_values), dtype=object)
+    values[:] = [decode_value(value) for value in raw_values]
+
+    sheets = {}
+    for entry in meta["sheets"]:
+        codes = np.load(directory / entry["data_file" if data_only else "file"], mmap_mode="r")
+        sheets[entry["name"]] = GridSheet(entry["name"], codes, values)
+    return GridWorkbook(directory, meta, sheets)
+
+
+def snapshot_is_current(filepath, directory):
+    """
+    True if the snapshot in directory was built from the workbook's current
+    content. A changed mtime with unchanged content refreshes the stored mtime.
+    """
+    meta = read_meta(directory)
+    if meta is None:
+        return False
+
+    source = meta["source"]
+    stat = os.stat(filepath)
+    if stat.st_size != source["size"]:
+        return False
+    if stat.st_mtime_ns == source["mtime_ns"]:
+        return True
+
+    sha256 = file_sha256(filepath)
+    if sha256 != source["sha256"]:
+        return False
+    meta["source"] = source_fingerprint(filepath, sha256)
+    with open(Path(directory) / META_FILE, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return True
+
+
+def open_snapshot(filepath, directory=None, data_only=False):
+    """Load the workbook's snapshot, building or rebuilding it first if it is stale"""
+    directory = Path(directory or snapshot_dir_for(filepath))
+    if snapshot_is_current(filepath, directory):
+        logger.info("Using snapshot %s", directory)
+        return load_snapshot(directory, data_only)
+    return build_snapshot(filepath, directory, data_only=data_only)
+
+
+def add_snapshot_arguments(parser):
+    """Add --snapshot/--snapshot-dir options to an argparse parser"""
+    parser.add_argument("--snapshot", action="store_true",
+                        help="read the workbook through its decoded-grid snapshot, "
+                             "building it if missing or stale")
+    parser.add_argument("--snapshot-dir",
+                        help=f"snapshot directory (default: {DEFAULT_SNAPSHOT_ROOT}/<workbook name>)")
+
+
+def snapshot_dir_from_args(args, filepath):
+    """Snapshot directory selected by add_snapshot_arguments options, or None"""
+    if not (args.snapshot or args.snapshot_dir):
+        return None
+    return Path(args.snapshot_dir) if args.snapshot_dir else snapshot_dir_for(filepath)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("excel_file", nargs="?", default="Overcooked 2 Full Task Analysis.xlsx",
+                        help="workbook to snapshot (default: %(default)s)")
+    parser.add_argument("--snapshot-dir",
+                        help=f"snapshot directory (default: {DEFAULT_SNAPSHOT_ROOT}/<workbook name>)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the snapshot is current")
+    args = parser.parse_args()
+
+    directory = Path(args.snapshot_dir or snapshot_dir_for(args.excel_file))
+    if not args.force and snapshot_is_current(args.excel_file, directory):
+        print(f"✓ Snapshot {directory} is current")
+        return
+
+    wb = build_snapshot(args.excel_file, directory)
+    print(f"✓ Wrote snapshot of {len(wb.sheetnames)} sheets to {directory}")
+
+
+if __name__ == "__main__":
+    main()
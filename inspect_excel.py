@@ -1,50 +1,241 @@
 #!/usr/bin/env python3
 """
 Diagnostic script to inspect the structure of the Excel file.
+
+Answers targeted queries by streaming only the rows they need from a
+read-only workbook:
+
+    inspect_excel.py                                first 85 x 30 cells of World 1
+    inspect_excel.py --sheet "World 2" --range C1:E40
+    inspect_excel.py --find "Obstacle Type"         every cell with that label, in all sheets
+    inspect_excel.py --level 3.4                    the block of Level 3.4
+
+--find and --level use a per-sheet label -> (row, col) index of the text
+cells, cached in --index-dir by each sheet's content hash, so only sheets
+changed since the last query are read again.
 """
 
-import openpyxl
+import argparse
+import zipfile
 from pathlib import Path
 
+from openpyxl.utils import get_column_letter, range_boundaries
+
+from xlsx_reader import iter_sheet_rows, open_workbook
+from grid_snapshot import add_snapshot_arguments, open_snapshot, snapshot_dir_from_args
+from sheet_cache import SheetCache, sheet_content_hashes, sheet_part_paths
+from field_schema import LEVEL_HEADER_RE
+
+
+# Bump when build_label_index changes so cached indexes are rebuilt
+LABEL_INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = ".label_index"
+# One cache entry per sheet
+INDEX_CACHE_ENTRIES = 256
+
+
+def open_inspected_workbook(filepath, snapshot_dir=None):
+    """Read-only workbook, or its grid snapshot with a snapshot_dir"""
+    if snapshot_dir is not None:
+        return open_snapshot(filepath, snapshot_dir)
+    # Read-only: only the displayed rows of the requested sheet are decoded
+    return open_workbook(filepath, read_only=True)
+
+
+def worksheet(wb, sheet_name):
+    """Sheet of a workbook; ValueError listing the sheets if there is none by that name"""
+    if sheet_name not in wb.sheetnames:
+        raise ValueError(f"no sheet '{sheet_name}' (sheets: {', '.join(wb.sheetnames)})")
+    return wb[sheet_name]
 
-def inspect_excel(filepath, max_rows=85, max_cols=30):
+
+def inspect_excel(filepath, max_rows=85, max_cols=30, snapshot_dir=None, sheet_name="World 1"):
     """Inspect and display the structure of the Excel file"""
-    wb = openpyxl.load_workbook(filepath)
-    worlds=[1]
-    for i in worlds:
-        sheet = wb[f"World {i}"]
+    wb = open_inspected_workbook(filepath, snapshot_dir)
+    try:
+        inspect_sheet(worksheet(wb, sheet_name), max_rows, max_cols)
+    finally:
+        wb.close()
+
+
+def inspect_sheet(sheet, max_rows, max_cols):
+    """Print a sheet's dimensions and its top-left max_rows x max_cols cells"""
+    # Read-only sheets take their dimensions from the sheet XML, which may omit them
+    print(f"Sheet name: {sheet.title}")
+    print(f"Max row: {sheet.max_row}")
+    print(f"Max column: {sheet.max_column}")
+    print("\n" + "=" * 80)
+    print("First few rows and columns:")
+    print("=" * 80 + "\n")
+
+    print_range(sheet, 1, max_rows, 1, max_cols)
+
+
+def print_range(sheet, min_row, max_row, min_col, max_col, skip_empty=False):
+    """Print the cells of a 1-based inclusive range, one row per line"""
+    for row_idx, row in iter_sheet_rows(sheet, min_row, max_row, min_col, max_col):
+        if skip_empty and all(value is None for value in row):
+            continue
+        row_data = []
+        for col_idx, value in enumerate(row, start=min_col):
+            value = value if value is not None else ""
+            # Truncate long values
+            value_str = str(value)[:30]
+            row_data.append(f"[{col_idx}] {value_str}")
+
+        print(f"Row {row_idx:3d}: {' | '.join(row_data)}")
+
+        if row_idx % 10 == 0:
+            print("-" * 80)
+
 
-        print(f"Sheet name: {sheet.title}")
-        print(f"Max row: {sheet.max_row}")
-        print(f"Max column: {sheet.max_column}")
-        print("\n" + "=" * 80)
-        print("First few rows and columns:")
-        print("=" * 80 + "\n")
+def inspect_range(filepath, sheet_name, cell_range, snapshot_dir=None):
+    """Print a range such as 'C1:E40' of one sheet; rows after its end are not read"""
+    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+    wb = open_inspected_workbook(filepath, snapshot_dir)
+    try:
+        sheet = worksheet(wb, sheet_name)
+        print(f"{sheet_name}!{cell_range}\n")
+        print_range(sheet, min_row or 1, max_row, min_col or 1, max_col)
+    finally:
+        wb.close()
 
-        # Display the first max_rows rows and max_cols columns
-        for row_idx, row in enumerate(sheet.iter_rows(max_row=max_rows, max_col=max_cols), start=1):
-            row_data = []
-            for col_idx, cell in enumerate(row, start=1):
-                value = cell.value if cell.value is not None else ""
-                # Truncate long values
-                value_str = str(value)[:30]
-                row_data.append(f"[{col_idx}] {value_str}")
 
-            print(f"Row {row_idx:3d}: {' | '.join(row_data)}")
+def build_label_index(sheet):
+    """{label: [[row, col], ...]} of the stripped, non-empty text cells of a sheet"""
+    index = {}
+    for row_idx, row in iter_sheet_rows(sheet):
+        for col_idx, value in enumerate(row, start=1):
+            if isinstance(value, str) and value.strip():
+                index.setdefault(value.strip(), []).append([row_idx, col_idx])
+    return index
 
-            if row_idx % 10 == 0:
-                print("-" * 80)
+
+def load_label_indexes(filepath, cache, snapshot_dir=None):
+    """
+    {sheet name: label index} for every sheet, in workbook order. Cached
+    indexes are used as they are; the workbook is only opened to index
+    sheets that changed.
+    """
+    with zipfile.ZipFile(filepath) as zf:
+        sheet_names = list(sheet_part_paths(zf))
+    keys = sheet_content_hashes(filepath, sheet_names, salt=f"labels-{LABEL_INDEX_VERSION}")
+    indexes = {sheet_name: cache.get(keys[sheet_name]) for sheet_name in sheet_names}
+
+    missing = [sheet_name for sheet_name, index in indexes.items() if index is None]
+    if missing:
+        wb = open_inspected_workbook(filepath, snapshot_dir)
+        try:
+            for sheet_name in missing:
+                indexes[sheet_name] = build_label_index(wb[sheet_name])
+                cache.put(keys[sheet_name], sheet_name, indexes[sheet_name])
+        finally:
+            wb.close()
+    return indexes
+
+
+def find_label(indexes, label, contains=False):
+    """[(sheet, row, col, text)] of cells whose text equals (or contains) label, ignoring case"""
+    wanted = label.strip().lower()
+    matches = []
+    for sheet_name, index in indexes.items():
+        sheet_matches = []
+        for text, positions in index.items():
+            folded = text.lower()
+            if folded == wanted or (contains and wanted in folded):
+                sheet_matches.extend((row, col, text) for row, col in positions)
+        matches.extend((sheet_name, row, col, text) for row, col, text in sorted(sheet_matches))
+    return matches
+
+
+def level_block_columns(index, level_header):
+    """
+    (first, last) column of a level's block in a sheet: from its header in
+    row 1 up to the column before the next header, None if it is not there
+    """
+    header = level_header.lower()
+    header_cols = sorted(col for text, positions in index.items() if LEVEL_HEADER_RE.match(text)
+                         for row, col in positions if row == 1)
+    starts = [col for text, positions in index.items() if text.lower() == header
+              for row, col in positions if row == 1]
+    if not starts:
+        return None
+    start = starts[0]
+    following = [col for col in header_cols if col > start]
+    # A block is header, field and value columns when it is the last one
+    return start, following[0] - 1 if following else start + 2
+
+
+def cell_ref(sheet_name, row, col):
+    return f"{sheet_name}!{get_column_letter(col)}{row}"
 
 
 def main():
-    excel_file = Path("Overcooked 2 Full Task Analysis.xlsx")
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("excel_file", nargs="?", default="Overcooked 2 Full Task Analysis.xlsx",
+                        help="task analysis workbook (default: %(default)s)")
+    parser.add_argument("--sheet", default="World 1", help="sheet shown or sliced (default: %(default)s)")
+    parser.add_argument("--rows", type=int, default=85, help="rows shown without a query (default: %(default)s)")
+    parser.add_argument("--cols", type=int, default=30,
+                        help="columns shown without a query (default: %(default)s)")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--range", metavar="A1:F20", help="print this range of --sheet")
+    query.add_argument("--find", metavar="LABEL", help="list the cells holding LABEL in every sheet")
+    query.add_argument("--level", metavar="W.L", help="print the block of a level, e.g. 3.4")
+    parser.add_argument("--contains", action="store_true", help="--find matches cells containing LABEL")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR,
+                        help="directory of cached label indexes (default: %(default)s)")
+    add_snapshot_arguments(parser)
+    args = parser.parse_args()
+
+    excel_file = Path(args.excel_file)
 
     if not excel_file.exists():
         print(f"Error: File '{excel_file}' not found!")
         return
 
-    print(f"Inspecting {excel_file}...\n")
-    inspect_excel(excel_file)
+    snapshot_dir = snapshot_dir_from_args(args, excel_file)
+
+    if args.range:
+        try:
+            inspect_range(excel_file, args.sheet, args.range, snapshot_dir)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    if not (args.find or args.level):
+        print(f"Inspecting {excel_file}...\n")
+        try:
+            inspect_excel(excel_file, args.rows, args.cols, snapshot_dir, args.sheet)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    cache = SheetCache(args.index_dir, max_entries=INDEX_CACHE_ENTRIES)
+    indexes = load_label_indexes(excel_file, cache, snapshot_dir)
+
+    if args.find:
+        matches = find_label(indexes, args.find, args.contains)
+        for sheet_name, row, col, text in matches:
+            print(f"{cell_ref(sheet_name, row, col):>20}  {text[:60]}")
+        print(f"\n✓ {len(matches)} cells match '{args.find}'")
+        return
+
+    level_header = f"Level {args.level}"
+    for sheet_name, index in indexes.items():
+        columns = level_block_columns(index, level_header)
+        if columns is None:
+            continue
+        first, last = columns
+        print(f"{level_header}: {sheet_name}!{get_column_letter(first)}:{get_column_letter(last)}\n")
+        wb = open_inspected_workbook(excel_file, snapshot_dir)
+        try:
+            print_range(wb[sheet_name], 1, None, first, last, skip_empty=True)
+        finally:
+            wb.close()
+        return
+    print(f"Error: '{level_header}' not found in row 1 of any sheet")
 
 
 if __name__ == "__main__":
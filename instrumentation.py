@@ -0,0 +1,252 @@
+"""
+Logging, stage timers, counters and profiling for the data build scripts.
+
+Logging goes through the "overcooked" logger and is silent below WARNING
+unless configure_logging() raises the verbosity. A RunReport times named
+stages, collects counters such as cells read and rows scanned, samples peak
+memory, can wrap chosen stages in cProfile, and is written as JSON.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+ROOT_LOGGER = "overcooked"
+
+# Silent when imported; scripts opt in to output with configure_logging()
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(name):
+    """Logger for a build module, e.g. get_logger('parse') -> 'overcooked.parse'"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class KeyValueFormatter(logging.Formatter):
+    """'LEVEL logger: message key=value ...' with the fields passed via log_event"""
+
+    def format(self, record):
+        line = f"{record.levelname:7s} {record.name}: {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def verbosity_to_level(verbosity):
+    """0 -> WARNING, 1 -> INFO, 2+ -> DEBUG; negative (quiet) -> ERROR"""
+    if verbosity < 0:
+        return logging.ERROR
+    return {0: logging.WARNING, 1: logging.INFO}.get(verbosity, logging.DEBUG)
+
+
+def configure_logging(verbosity=0, json_format=False, stream=None):
+    """Send "overcooked" log records at the given verbosity to stderr"""
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if json_format else KeyValueFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(verbosity_to_level(verbosity))
+    logger.propagate = False
+
+
+def add_logging_arguments(parser):
+    """Add -v/-q/--log-json/--report/--profile options to an argparse parser"""
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="log progress (-v) or every parsed field (-vv)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log errors")
+    parser.add_argument("--log-json", action="store_true", help="log one JSON object per line")
+    parser.add_argument("--report", help="write a JSON run report with stage timings and counters")
+    parser.add_argument("--profile", action="append", default=[], metavar="STAGE",
+                        help="run STAGE under cProfile (repeatable, 'all' for every stage)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record peak traced Python memory per stage (slower)")
+
+
+def configure_from_args(args):
+    """Configure logging from add_logging_arguments options and return a RunReport"""
+    configure_logging(-1 if args.quiet else args.verbose, json_format=args.log_json)
+    return RunReport(profile_stages=args.profile,
+                     profile_dir=Path(args.report).parent if args.report else Path("."),
+                     trace_memory=args.trace_memory)
+
+
+class LogCollector(logging.Handler):
+    """
+    Context manager that collects "overcooked" log records, e.g. in a pool
+    worker, so the parent process can replay them in a deterministic order.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        message = record.getMessage()
+        # Tracebacks do not pickle; they travel as text after the message
+        if record.exc_info:
+            message += "\n" + logging.Formatter().formatException(record.exc_info)
+        self.records.append((record.name, record.levelno, message, getattr(record, "fields", None)))
+
+    def __enter__(self):
+        logging.getLogger(ROOT_LOGGER).addHandler(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        logging.getLogger(ROOT_LOGGER).removeHandler(self)
+
+    @staticmethod
+    def replay(records):
+        for name, level, message, fields in records:
+            logger = logging.getLogger(name)
+            if logger.isEnabledFor(level):
+                logger.log(level, "%s", message, extra={"fields": fields} if fields else None)
+
+
+def capture_worker_logging(level):
+    """In a pool worker: keep the parent's level but drop inherited output handlers"""
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def log_event(logger, level, message, **fields):
+    """Log a message with structured key=value fields"""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields})
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 3)
+
+
+class RunReport:
+    """
+    Collects per-stage wall time, counters and peak memory for one run.
+
+        report = RunReport()
+        with report.stage("parse"):
+            ...
+            report.count("cells_read", 120)
+        report.write("run_report.json")
+    """
+
+    def __init__(self, profile_stages=(), profile_dir=".", trace_memory=False):
+        self.started = datetime.now(timezone.utc)
+        self.stages = {}
+        self.counters = {}
+        self.profile_stages = set(profile_stages)
+        self.profile_dir = Path(profile_dir)
+        self.trace_memory = trace_memory
+        self._current = None
+        self._logger = get_logger("report")
+
+    def _should_profile(self, name):
+        return name in self.profile_stages or "all" in self.profile_stages
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage; counters recorded inside it are attributed to it"""
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "counters": {}})
+        parent, self._current = self._current, entry
+        profiler = cProfile.Profile() if self._should_profile(name) else None
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        log_event(self._logger, logging.INFO, "stage started", stage=name)
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield entry
+        finally:
+            if profiler:
+                profiler.disable()
+            entry["seconds"] += time.perf_counter() - start
+            entry["peak_rss_mb"] = peak_rss_mb()
+            if tracing:
+                entry["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3)
+                tracemalloc.stop()
+            if profiler:
+                entry["profile"] = str(self._dump_profile(name, profiler))
+            self._current = parent
+            log_event(self._logger, logging.INFO, "stage finished", stage=name,
+                      seconds=round(entry["seconds"], 4), **entry["counters"])
+
+    def _dump_profile(self, name, profiler):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f"profile_{name}.prof"
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+        self._logger.info("profile for stage %s written to %s\n%s", name, path, summary.getvalue())
+        return path
+
+    def count(self, name, amount=1):
+        """Add to a counter, both run-wide and for the current stage"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+        if self._current is not None:
+            counters = self._current["counters"]
+            counters[name] = counters.get(name, 0) + amount
+
+    def count_all(self, stats):
+        """Add every counter from a stats dict"""
+        for name, amount in stats.items():
+            self.count(name, amount)
+
+    def to_dict(self):
+        return {
+            "started": self.started.isoformat(),
+            "total_seconds": round(sum(s["seconds"] for s in self.stages.values()), 6),
+            "peak_rss_mb": peak_rss_mb(),
+            "counters": self.counters,
+            "stages": self.stages,
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,141 @@
+"""
+Change-aware JSON output for the data build scripts.
+
+write_json() only replaces a file when its content would change: the new
+data is compared with the existing file by a canonical hash (sorted keys,
+no whitespace), so a no-op rebuild leaves public/ untouched and does not
+trigger a redeploy. Writes go to a temporary file in the same directory
+and are moved into place with os.replace, so readers never see a partial
+file. For level maps the result lists the added, removed and changed levels.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from instrumentation import get_logger, log_event
+
+
+logger = get_logger("output")
+
+
+def canonical_hash(data):
+    """SHA-256 of data as sorted-key, whitespace-free JSON"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def diff_levels(old, new):
+    """
+    {"added": [...], "removed": [...], "changed": {key: [changed fields]}}
+    between two {level_key: level dict} maps
+    """
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    changed = {}
+    for key in new:
+        if key not in old or old[key] == new[key]:
+            continue
+        old_level, new_level = old[key], new[key]
+        if isinstance(old_level, dict) and isinstance(new_level, dict):
+            fields = [field for field in {**old_level, **new_level}
+                      if old_level.get(field) != new_level.get(field)]
+        else:
+            fields = []
+        changed[key] = fields
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def read_existing(path):
+    """Parsed content of an existing JSON file, None if missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def file_mode(path):
+    """Permission bits of an existing file, else the default for new files under the umask"""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_bytes(path, data):
+    """Write bytes to a temporary file next to path, then rename it over path"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent or ".")
+    try:
+        # mkstemp creates the file 0600; give it the mode a plain open() would
+        os.chmod(tmp_path, file_mode(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def atomic_write_text(path, text):
+    """Write UTF-8 text to a temporary file next to path, then rename it over path"""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def write_bytes(path, data):
+    """Write bytes unless the file already holds exactly them; True if it was written"""
+    path = Path(path)
+    try:
+        if path.read_bytes() == data:
+            log_event(logger, logging.INFO, "Output unchanged, not rewritten", path=path)
+            return False
+    except OSError:
+        pass
+    atomic_write_bytes(path, data)
+    log_event(logger, logging.INFO, "Output written", path=path)
+    return True
+
+
+def write_json(path, data, level_diff=True, **dump_options):
+    """
+    Write data as JSON (json.dumps options such as indent) unless the file
+    already holds the same content. Returns {"written": bool, "added",
+    "removed", "changed"}; the diff is empty unless level_diff and both old
+    and new data are dicts.
+    """
+    path = Path(path)
+    existing = read_existing(path) if path.exists() else None
+
+    result = {"written": False, "added": [], "removed": [], "changed": {}}
+    if existing is not None and canonical_hash(existing) == canonical_hash(data):
+        log_event(logger, logging.INFO, "Output unchanged, not rewritten", path=path)
+        return result
+
+    diffed = level_diff and isinstance(existing, dict) and isinstance(data, dict)
+    if diffed:
+        result.update(diff_levels(existing, data))
+
+    atomic_write_text(path, json.dumps(data, **dump_options))
+    result["written"] = True
+
+    if diffed:
+        log_event(logger, logging.INFO, "Output written", path=path, added=len(result["added"]),
+                  removed=len(result["removed"]), changed=len(result["changed"]))
+    else:
+        log_event(logger, logging.INFO, "Output written", path=path)
+    for key in result["added"]:
+        logger.debug("%s: added", key)
+    for key in result["removed"]:
+        logger.debug("%s: removed", key)
+    for key, fields in result["changed"].items():
+        logger.debug("%s: changed %s", key, ", ".join(map(str, fields)))
+    return result
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Typed level records, a compact binary snapshot and a typed JSON exporter.
+
+The build scripts keep every field as a string ("20", "yes", "2:30"). A
+LevelRecord converts each field once into a real int, float, bool or
+duration in seconds so downstream stages don't have to reparse them.
+"""
+
+import argparse
+import json
+import struct
+from array import array
+from pathlib import Path
+
+from json_output import write_json
+
+
+# Field name -> kind, in the order fields appear in the level JSON
+FIELD_KINDS = {
+    "time_to_complete": "duration",
+    "start_at_go": "bool",
+    "one_star_score": "float",
+    "points_composite_1": "range",
+    "points_composite_2": "range",
+    "tip_multiplier_x1": "float",
+    "tip_multiplier_x2": "float",
+    "tip_multiplier_x3": "float",
+    "fixed_environment": "bool",
+    "recipe_order_fixed": "bool",
+    "composite_num": "int",
+    "variation_num": "int",
+    "dish_washer": "bool",
+    "num_dishes": "int",
+    "has_chopping_board": "bool",
+    "num_chopping_boards": "int",
+    "has_oven": "bool",
+    "num_ovens": "int",
+    "has_stove_tops": "bool",
+    "num_stove_tops": "int",
+    "has_mixers": "bool",
+    "num_mixers": "int",
+    "num_completed_composite_for_star": "int",
+    "penalty_failed_composite": "text",
+    "challenge_score": "float",
+    "additional_notes": "text",
+    "video_link": "text",
+    "num_obstacles": "int",
+}
+
+FIELDS = tuple(FIELD_KINDS)
+
+
+def parse_duration(value):
+    """Convert 'm:ss' to seconds"""
+    minutes, seconds = str(value).split(":")
+    return int(minutes) * 60 + int(seconds)
+
+
+def format_duration(seconds):
+    """Convert seconds to 'm:ss'"""
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def parse_range(value):
+    """Convert '48 - 64' or '28' to a (low, high) pair of floats"""
+    parts = str(value).split(" - ")
+    if len(parts) > 2:
+        raise ValueError(f"expected a number or 'low - high', got {value!r}")
+    low, high = float(parts[0]), float(parts[-1])
+    return (low, high)
+
+
+def parse_int(value):
+    num = float(value)
+    if not num.is_integer():
+        raise ValueError(f"expected a whole number, got {value!r}")
+    return int(num)
+
+
+def parse_bool(value):
+    lower_val = str(value).strip().lower()
+    if lower_val in ("yes", "y", "true", "1"):
+        return True
+    if lower_val in ("no", "n", "false", "0"):
+        return False
+    raise ValueError(f"expected yes/no, got {value!r}")
+
+
+CONVERTERS = {
+    "duration": parse_duration,
+    "bool": parse_bool,
+    "int": parse_int,
+    "float": float,
+    "range": parse_range,
+    "text": str,
+}
+
+
+class LevelRecord:
+    """One level with typed fields; missing values are None"""
+
+    __slots__ = ("level_key", "extra") + FIELDS
+
+    def __init__(self, level_key, **values):
+        self.level_key = level_key
+        self.extra = {}
+        for field in FIELDS:
+            setattr(self, field, values.pop(field, None))
+        self.extra.update(values)
+
+    @classmethod
+    def from_dict(cls, level_key, level):
+        """Convert a string-valued level dict from the build scripts"""
+        values = {}
+        for key, value in level.items():
+            kind = FIELD_KINDS.get(key)
+            if kind is None:
+                values[key] = value
+            elif value in ("", None):
+                values[key] = None
+            else:
+                try:
+                    values[key] = CONVERTERS[kind](value)
+                except (ValueError, TypeError) as e:
+                    raise ValueError(f"{level_key}.{key}: {e}") from None
+        return cls(level_key, **values)
+
+    def get(self, field):
+        """Typed value of a field, or the raw value of an extra field; None if missing"""
+        return getattr(self, field) if field in FIELD_KINDS else self.extra.get(field)
+
+    def to_dict(self):
+        """Typed dict for JSON export, durations in seconds and ranges as [low, high]"""
+        data = {field: getattr(self, field) for field in FIELDS}
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"LevelRecord({self.level_key!r})"
+
+
+def load_records(data):
+    """Convert a levels dict keyed by level name to a list of LevelRecords"""
+    return [LevelRecord.from_dict(level_key, level) for level_key, level in data.items()]
+
+
+# --------------------
+# Binary snapshot
+# --------------------
+# Layout: magic, version, level count, field count, then for each field its
+# name, kind code, a presence bitmap and its packed values (struct-of-arrays).
+# Text is stored as one UTF-8 blob plus offsets; extra fields as a JSON blob.
+
+SNAPSHOT_MAGIC = b"OCLV"
+SNAPSHOT_VERSION = 1
+KIND_CODES = {"duration": 0, "bool": 1, "int": 2, "float": 3, "text": 4, "range": 5}
+KIND_NAMES = {code: kind for kind, code in KIND_CODES.items()}
+# array typecodes for fixed-width kinds
+ARRAY_TYPES = {"duration": "i", "bool": "b", "int": "q", "float": "d"}
+
+
+def _pack_bytes(out, data):
+    out += struct.pack("<I", len(data))
+    out += data
+
+
+def _unpack_bytes(buf, offset):
+    (length,) = struct.unpack_from("<I", buf, offset)
+    offset += 4
+    return bytes(buf[offset:offset + length]), offset + length
+
+
+def _bitmap(flags):
+    bits = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def _unbitmap(bits, n):
+    return [bool(bits[i >> 3] & (1 << (i & 7))) for i in range(n)]
+
+
+def dump_snapshot(records):
+    """Serialize LevelRecords to bytes"""
+    out = bytearray(SNAPSHOT_MAGIC)
+    out += struct.pack("<HII", SNAPSHOT_VERSION, len(records), len(FIELDS))
+    _pack_bytes(out, "\n".join(r.level_key for r in records).encode("utf-8"))
+
+    for field in FIELDS:
+        kind = FIELD_KINDS[field]
+        values = [getattr(r, field) for r in records]
+        _pack_bytes(out, field.encode("utf-8"))
+        out += struct.pack("<B", KIND_CODES[kind])
+        _pack_bytes(out, _bitmap([v is not None for v in values]))
+
+        if kind == "text":
+            encoded = [(v or "").encode("utf-8") for v in values]
+            offsets = array("I", [0])
+            for item in encoded:
+                offsets.append(offsets[-1] + len(item))
+            _pack_bytes(out, offsets.tobytes())
+            _pack_bytes(out, b"".join(encoded))
+        elif kind == "range":
+            packed = array("d")
+            for v in values:
+                packed.extend(v if v is not None else (0.0, 0.0))
+            _pack_bytes(out, packed.tobytes())
+        else:
+            packed = array(ARRAY_TYPES[kind], [v if v is not None else 0 for v in values])
+            _pack_bytes(out, packed.tobytes())
+
+    _pack_bytes(out, json.dumps([r.extra for r in records], separators=(",", ":")).encode("utf-8"))
+    return bytes(out)
+
+
+def load_snapshot(buf):
+    """Deserialize bytes written by dump_snapshot to LevelRecords"""
+    buf = memoryview(buf)
+    if bytes(buf[:4]) != SNAPSHOT_MAGIC:
+        raise ValueError("not a level snapshot")
+    version, n_levels, n_fields = struct.unpack_from("<HII", buf, 4)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    offset = 4 + struct.calcsize("<HII")
+
+    keys_blob, offset = _unpack_bytes(buf, offset)
+    level_keys = keys_blob.decode("utf-8").split("\n") if n_levels else []
+    columns = {}
+
+    for _ in range(n_fields):
+        name, offset = _unpack_bytes(buf, offset)
+        (kind_code,) = struct.unpack_from("<B", buf, offset)
+        offset += 1
+        kind = KIND_NAMES[kind_code]
+        bits, offset = _unpack_bytes(buf, offset)
+        present = _unbitmap(bits, n_levels)
+
+        if kind == "text":
+            offsets_blob, offset = _unpack_bytes(buf, offset)
+            text_blob, offset = _unpack_bytes(buf, offset)
+            offsets = array("I")
+            offsets.frombytes(offsets_blob)
+            values = [text_blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n_levels)]
+        elif kind == "range":
+            packed_blob, offset = _unpack_bytes(buf, offset)
+            packed = array("d")
+            packed.frombytes(packed_blob)
+            values = list(zip(packed[0::2], packed[1::2]))
+        else:
+            packed_blob, offset = _unpack_bytes(buf, offset)
+            packed = array(ARRAY_TYPES[kind])
+            packed.frombytes(packed_blob)
+            values = packed.tolist()
+            if kind == "bool":
+                values = [bool(v) for v in values]
+
+        columns[name.decode("utf-8")] = [v if p else None for v, p in zip(values, present)]
+
+    extras_blob, offset = _unpack_bytes(buf, offset)
+    extras = json.loads(extras_blob)
+
+    records = []
+    for i, level_key in enumerate(level_keys):
+        values = {field: column[i] for field, column in columns.items()}
+        values.update(extras[i])
+        records.append(LevelRecord(level_key, **values))
+    return records
+
+
+def write_snapshot(records, path):
+    Path(path).write_bytes(dump_snapshot(records))
+
+
+def read_snapshot(path):
+    return load_snapshot(Path(path).read_bytes())
+
+
+def export_typed_json(records, output_path, indent=None):
+    """Write {level_key: typed level dict} JSON"""
+    data = {r.level_key: r.to_dict() for r in records}
+    write_json(output_path, data, indent=indent, ensure_ascii=False)
+    return data
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", nargs="?", default="public/levels_with_scores.json",
+                        help="string-valued level JSON (default: %(default)s)")
+    parser.add_argument("--snapshot", help="write a binary snapshot to this path")
+    parser.add_argument("--typed-json", help="write typed JSON to this path")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        records = load_records(json.load(f))
+
+    if args.snapshot:
+        write_snapshot(records, args.snapshot)
+        print(f"✓ Snapshot of {len(records)} levels written to {args.snapshot}"
+              f" ({Path(args.snapshot).stat().st_size} bytes)")
+    if args.typed_json:
+        export_typed_json(records, args.typed_json)
+        print(f"✓ Typed JSON written to {args.typed_json}")
+
+
+if __name__ == "__main__":
+    main()
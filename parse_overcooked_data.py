@@ -3,50 +3,29 @@
 Script to parse Overcooked 2 Full Task Analysis.xlsx and generate JSON data.
 """
 
-import openpyxl
+import argparse
+import logging
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from datetime import time
-
-
-# Mapping of Excel field names to JSON keys
-FIELD_MAPPING = {
-    # Basic level info
-    "Level Time (mm:ss)": "time_to_complete",
-    "Does Clock start at \"Go\" ?": "start_at_go",
-    "Is Environment Fixed?": "fixed_environment",
-    "Number of Recipes": "composite_num",  # We'll handle variations separately
-    "Dish Washer?": "dish_washer",
-    "Score for 1 Star (2 Players)": "one_star_score",
-    "Number of Dishes": "num_dishes",
-    "Challenge Score": "challenge_score",
-
-    # Points and scoring
-    "Points given for completing Composite Challenge 1": "points_composite_1",
-    "Points given for completing Composite Challenge 2": "points_composite_2",
-    "Tip Multiplier (x1)": "tip_multiplier_x1",
-    "Tip Multiplier (x2)": "tip_multiplier_x2",
-    "Tip Multiplier (x3)": "tip_multiplier_x3",
-
-    # Recipe and challenge info
-    "Is Recipe (Composite Challenge) Order Fixed?": "recipe_order_fixed",
-    "Number of Completed Composite Challenges needed to achieve 1 Star (2 Players)": "num_completed_composite_for_star",
-    "Penalty for failing a Composite Challenge": "penalty_failed_composite",
-
-    # Equipment
-    "Chopping Board?": "has_chopping_board",
-    "Number of Chopping Boards": "num_chopping_boards",
-    "Oven?": "has_oven",
-    "Number of Ovens": "num_ovens",
-    "Stove-Tops?": "has_stove_tops",
-    "Number of Stove-Tops?": "num_stove_tops",
-    "Mixers?": "has_mixers",
-    "Number of Mixers?": "num_mixers",
-
-    # Notes
-    "Additional Notes": "additional_notes",
-}
+
+from instrumentation import (LogCollector, add_logging_arguments, capture_worker_logging,
+                             configure_from_args, get_logger, log_event)
+from sheet_cache import SheetCache, sheet_content_hashes
+from xlsx_reader import first_row, iter_column_values, open_workbook
+from grid_snapshot import add_snapshot_arguments, load_snapshot, open_snapshot, snapshot_dir_from_args
+from json_output import write_json
+from field_schema import COMPILED, LEVEL_HEADER_RE, clean_text
+
+
+logger = get_logger("parse")
+
+
+# Mapping of Excel field names to JSON keys, from the field schema
+FIELD_MAPPING = COMPILED.field_mapping
 
 
 def is_level_header(value):
@@ -55,7 +34,7 @@ def is_level_header(value):
         return False
     value_str = str(value).strip()
     # Match pattern like "Level 1.1", "Level 2.3", etc.
-    match = re.match(r'^Level (\d+\.\d+)$', value_str, re.IGNORECASE)
+    match = LEVEL_HEADER_RE.match(value_str)
     return match.group(1) if match else None
 
 
@@ -64,171 +43,88 @@ def format_level_key(level_num):
     return f"Level_{level_num.replace('.', '_')}"
 
 
-def convert_time_to_mmss(value):
-    """Convert Excel time format to mm:ss"""
-    if value is None:
-        return "manual-input-needed"
+def level_sort_key(level_key):
+    """Sort key ordering 'Level_2_10' after 'Level_2_9' (world, then level)"""
+    return [int(n) for n in re.findall(r'\d+', level_key)]
 
-    # If it's already a datetime.time object from Excel
-    if isinstance(value, time):
-        # Excel stores time as HH:MM:SS where HH=minutes, MM=seconds for game time
-        minutes = value.hour
-        seconds = value.minute
-        return f"{minutes}:{seconds:02d}"
 
-    # If it's a string
+def validate_and_clean_value(field_name, value):
+    """Validate and clean values based on field type. Returns None if value is invalid/missing."""
+    if value is None:
+        return None
     value_str = str(value).strip()
-
-    # Try to parse HH:MM:SS format (Excel format where HH=minutes, MM=seconds)
-    time_match = re.match(r'^(\d+):(\d+):(\d+)$', value_str)
-    if time_match:
-        hours, mins, secs = map(int, time_match.groups())
-        # Hours field represents minutes, minutes field represents seconds
-        minutes = hours
-        seconds = mins
-        return f"{minutes}:{seconds:02d}"
-
-    # Try mm:ss format (already correct)
-    if re.match(r'^\d+:\d{2}$', value_str):
-        return value_str
-
-    return "manual-input-needed"
+    if value_str == "":
+        return None
+    return COMPILED.cleaners.get(field_name, clean_text)(value, value_str)
 
 
-def parse_number_of_recipes(value):
-    """Parse 'Number of Recipes' which might be '1 (2 variations)' or just '1.0'"""
-    if value is None or str(value).strip() == "":
-        return None, None
+# Equipment pairs: if has_X is "no", num_X defaults to "0"
+EQUIPMENT_MAPPINGS = COMPILED.zero_fill
 
-    value_str = str(value).strip()
 
-    # Check for pattern like "1 (2 variations)"
-    match = re.match(r'^(\d+)\s*\((\d+)\s*variations?\)$', value_str, re.IGNORECASE)
-    if match:
-        composite = match.group(1)
-        variations = match.group(2)
-        return composite, variations
+def default_level_data():
+    """Return a new level dict with default values (ordered as they appear in Excel)"""
+    return dict(COMPILED.default_level)
 
-    # Otherwise just a number
-    try:
-        num = float(value_str)
-        if num.is_integer():
-            return str(int(num)), None
-        return str(num), None
-    except (ValueError, AttributeError):
-        return None, None
 
+def find_level_columns(sheet):
+    """Find all level headers in row 1 and return their header/field/value columns"""
+    logger.debug("Scanning for level headers in row 1")
+    level_columns = {}
 
-def validate_and_clean_value(field_name, value):
-    """Validate and clean values based on field type. Returns None if value is invalid/missing."""
-    if value is None or str(value).strip() == "":
-        return None
+    for column, value in enumerate(first_row(sheet), start=1):
+        level_num = is_level_header(value)
+        if level_num:
+            level_key = format_level_key(level_num)
+            level_columns[level_key] = {
+                'header_col': column,
+                'field_col': column + 1,
+                'value_col': column + 2
+            }
+            logger.debug("Found %s at column %d (field col: %d, value col: %d)",
+                         value, column, column + 1, column + 2)
 
-    value_str = str(value).strip()
+    logger.debug("Found %d levels", len(level_columns))
+    return level_columns
 
-    # Time format validation
-    if field_name == "time_to_complete":
-        result = convert_time_to_mmss(value)
-        return None if result == "manual-input-needed" else result
-
-    # Yes/No fields
-    yes_no_fields = [
-        "start_at_go", "fixed_environment", "dish_washer",
-        "has_chopping_board", "has_oven", "has_stove_tops", "has_mixers",
-        "recipe_order_fixed"
-    ]
-    if field_name in yes_no_fields:
-        lower_val = value_str.lower()
-        if lower_val in ["yes", "no", "y", "n"]:
-            return "yes" if lower_val in ["yes", "y"] else "no"
-        return None
 
-    # Numeric fields
-    numeric_fields = [
-        "composite_num", "variation_num", "one_star_score", "challenge_score", "num_dishes",
-        "points_composite_1", "points_composite_2",
-        "tip_multiplier_x1", "tip_multiplier_x2", "tip_multiplier_x3",
-        "num_completed_composite_for_star",
-        "num_chopping_boards", "num_ovens", "num_stove_tops", "num_mixers"
-    ]
-    if field_name in numeric_fields:
-        # Skip "NA" values
-        if value_str.upper() == "NA":
-            return None
+def apply_field_value(level_data, field_str, value):
+    """Clean a raw cell value for the Excel field label and store it in level_data"""
+    cleaned_value = COMPILED.setters[field_str](level_data, value)
+    if cleaned_value is not None and logger.isEnabledFor(logging.DEBUG):
+        json_key = FIELD_MAPPING[field_str]
+        logger.debug("  %s: %s", json_key, cleaned_value)
+        if json_key == "composite_num" and level_data["variation_num"]:
+            logger.debug("  variation_num: %s", level_data["variation_num"])
 
-        try:
-            num_val = float(value_str)
-            if num_val.is_integer():
-                return str(int(num_val))
-            return str(num_val)
-        except (ValueError, AttributeError):
-            return None
 
-    # Text fields (penalty, notes) - accept as-is if not empty
-    if field_name in ["penalty_failed_composite", "additional_notes"]:
-        return value_str if value_str else None
+def fill_equipment_defaults(level_data):
+    """Post-processing: If has_X is "no", set num_X to "0" """
+    for has_field, num_field in EQUIPMENT_MAPPINGS:
+        if level_data.get(has_field) == "no":
+            if level_data.get(num_field) == "":
+                level_data[num_field] = "0"
 
-    return value_str
 
+def parse_sheet(sheet, sheet_name, stats=None):
+    """Parse a single sheet and extract level data
 
-def parse_sheet(sheet, sheet_name):
-    """Parse a single sheet and extract level data"""
+    Reads the whole field column of every level, cell by cell. Kept as the
+    reference path for the other modes; pass a stats dict to count cells read.
+    """
     levels_data = {}
+    cells_read = 0
 
     # Find all level headers in row 1
-    print(f"\n{'='*60}")
-    print(f"Processing {sheet_name}...")
-    print('='*60)
-    print("Scanning for level headers in row 1...")
-    level_columns = {}
-
-    for cell in sheet[1]:
-        level_num = is_level_header(cell.value)
-        if level_num:
-            level_key = format_level_key(level_num)
-            level_columns[level_key] = {
-                'header_col': cell.column,
-                'field_col': cell.column + 1,
-                'value_col': cell.column + 2
-            }
-            print(f"Found {cell.value} at column {cell.column} (field col: {cell.column + 1}, value col: {cell.column + 2})")
-
-    print(f"\nFound {len(level_columns)} levels")
+    logger.info("Processing %s", sheet_name)
+    level_columns = find_level_columns(sheet)
+    cells_read += sheet.max_column
 
     # For each level, scan through rows to find field values
     for level_key, cols in level_columns.items():
-        print(f"\nProcessing {level_key}...")
-
-        # Initialize level data with default values (ordered as they appear in Excel)
-        levels_data[level_key] = {
-            "time_to_complete": "",                     # Row 15
-            "start_at_go": "",                          # Row 16
-            "one_star_score": "",                       # Row 17
-            "points_composite_1": "",                   # Row 18
-            "points_composite_2": "",                   # Row 19
-            "tip_multiplier_x1": "",                    # Row 20
-            "tip_multiplier_x2": "",                    # Row 21
-            "tip_multiplier_x3": "",                    # Row 22
-            "fixed_environment": "",                    # Row 25
-            "recipe_order_fixed": "",                   # Row 26
-            "composite_num": "",                        # Row 27
-            "variation_num": "",                        # Row 27 (variations)
-            "dish_washer": "",                          # Row 28
-            "num_dishes": "",                           # Row 29
-            "has_chopping_board": "",                   # Row 30
-            "num_chopping_boards": "",                  # Row 31
-            "has_oven": "",                             # Row 32
-            "num_ovens": "",                            # Row 33
-            "has_stove_tops": "",                       # Row 34
-            "num_stove_tops": "",                       # Row 35
-            "has_mixers": "",                           # Row 36
-            "num_mixers": "",                           # Row 37
-            "num_completed_composite_for_star": "",     # Row 60
-            "penalty_failed_composite": "",             # Row 61
-            "challenge_score": "",                      # Row 64
-            "additional_notes": "",                     # Row 66
-            "video_link": ""                            # Not in Excel
-        }
+        logger.debug("Processing %s", level_key)
+
+        levels_data[level_key] = default_level_data()
 
         field_col = cols['field_col']
         value_col = cols['value_col']
@@ -237,64 +133,195 @@ def parse_sheet(sheet, sheet_name):
         for row in range(1, sheet.max_row + 1):
             field_cell = sheet.cell(row=row, column=field_col)
             field_value = field_cell.value
+            cells_read += 1
 
             if field_value:
                 field_str = str(field_value).strip()
 
                 # Check if this is one of our target fields
                 if field_str in FIELD_MAPPING:
-                    json_key = FIELD_MAPPING[field_str]
                     value_cell = sheet.cell(row=row, column=value_col)
-                    value = value_cell.value
-
-                    # Special handling for "Number of Recipes"
-                    if field_str == "Number of Recipes":
-                        composite, variations = parse_number_of_recipes(value)
-                        if composite:
-                            levels_data[level_key]["composite_num"] = composite
-                            print(f"  composite_num: {composite}")
-                        if variations:
-                            levels_data[level_key]["variation_num"] = variations
-                            print(f"  variation_num: {variations}")
-                    else:
-                        cleaned_value = validate_and_clean_value(json_key, value)
-                        # Set value (empty string if None)
-                        levels_data[level_key][json_key] = cleaned_value if cleaned_value is not None else ""
-                        if cleaned_value is not None:
-                            print(f"  {json_key}: {cleaned_value}")
-
-        # Post-processing: If has_X is "no", set num_X to "0"
-        equipment_mappings = [
-            ("has_chopping_board", "num_chopping_boards"),
-            ("has_oven", "num_ovens"),
-            ("has_stove_tops", "num_stove_tops"),
-            ("has_mixers", "num_mixers"),
-        ]
-
-        for has_field, num_field in equipment_mappings:
-            if levels_data[level_key].get(has_field) == "no":
-                if levels_data[level_key].get(num_field) == "":
-                    levels_data[level_key][num_field] = "0"
+                    cells_read += 1
+                    apply_field_value(levels_data[level_key], field_str, value_cell.value)
+
+        fill_equipment_defaults(levels_data[level_key])
+
+    if stats is not None:
+        stats['cells_read'] = stats.get('cells_read', 0) + cells_read
+        stats['scan_cells_read'] = stats.get('scan_cells_read', 0) + cells_read
+        stats['rows_scanned'] = stats.get('rows_scanned', 0) + sheet.max_row * len(level_columns)
 
     return levels_data
 
 
-def parse_excel_file(filepath):
-    """Parse the Excel file and extract level data from all World sheets"""
-    wb = openpyxl.load_workbook(filepath)
-    all_levels_data = {}
+def build_field_row_indexes(sheet, field_cols):
+    """
+    Read the field columns in one pass over the rows and return
+    {field column: [(row, field label), ...]} in row order
+    """
+    field_rows = {col: [] for col in field_cols}
+    for row, values in iter_column_values(sheet, field_cols):
+        for col, field_value in values.items():
+            if field_value:
+                field_str = str(field_value).strip()
+                if field_str in FIELD_MAPPING:
+                    field_rows[col].append((row, field_str))
+    return field_rows
+
+
+def is_complete_layout(field_rows):
+    """Check that every mapped field label appears exactly once"""
+    labels = [field_str for _, field_str in field_rows]
+    return len(labels) == len(FIELD_MAPPING) and set(labels) == set(FIELD_MAPPING)
+
+
+def parse_sheet_indexed(sheet, sheet_name, stats=None):
+    """Parse a single sheet using a field-label -> row index per level
+
+    The field columns of all level blocks are read in one pass over the
+    rows into a field-label -> row index per level; values are then pulled
+    only from the indexed rows of each value column. Every row of every
+    field column is read, since a mapped label may sit anywhere in it, so
+    this touches as many cells as parse_sheet ('cells_read' equals
+    'scan_cells_read' in stats) and only changes the access order. Levels
+    whose layout differs from the sheet's first complete layout are
+    logged. parse_sheet_streaming is the mode that saves work: it reads
+    each row once from a read-only workbook.
+    """
+    levels_data = {}
+
+    logger.info("Processing %s", sheet_name)
+    level_columns = find_level_columns(sheet)
+    max_row = sheet.max_row
+    field_cols = sorted({cols['field_col'] for cols in level_columns.values()})
+    field_rows_by_col = build_field_row_indexes(sheet, field_cols)
+    cells_read = sheet.max_column + max_row * len(field_cols)
+    scan_cells_read = sheet.max_column
+
+    shared_rows = None
+
+    for level_key, cols in level_columns.items():
+        logger.debug("Processing %s", level_key)
+
+        levels_data[level_key] = default_level_data()
+        field_rows = field_rows_by_col[cols['field_col']]
+        value_col = cols['value_col']
+
+        if shared_rows is None and is_complete_layout(field_rows):
+            shared_rows = field_rows
+        elif shared_rows is not None and field_rows != shared_rows:
+            logger.info("%s: layout differs from the sheet's first complete layout", level_key)
 
-    # Parse World 1 through World 6
+        for row, field_str in field_rows:
+            value = sheet.cell(row=row, column=value_col).value
+            apply_field_value(levels_data[level_key], field_str, value)
+
+        fill_equipment_defaults(levels_data[level_key])
+        cells_read += len(field_rows)
+        scan_cells_read += max_row + len(field_rows)
+
+    if stats is not None:
+        stats['cells_read'] = stats.get('cells_read', 0) + cells_read
+        stats['scan_cells_read'] = stats.get('scan_cells_read', 0) + scan_cells_read
+        stats['rows_scanned'] = stats.get('rows_scanned', 0) + max_row
+
+    return levels_data
+
+
+def parse_sheet_streaming(sheet, sheet_name, stats=None):
+    """Parse a single sheet in one pass over its rows
+
+    Works on read-only (streaming) worksheets: rows are read once, in order,
+    keeping only the level blocks' field and value columns, and each row's
+    labels are matched for every level before the row is dropped. Produces
+    the same output as parse_sheet.
+    """
+    logger.info("Processing %s", sheet_name)
+    level_columns = find_level_columns(sheet)
+    levels_data = {level_key: default_level_data() for level_key in level_columns}
+    blocks = [(level_key, cols['field_col'], cols['value_col']) for level_key, cols in level_columns.items()]
+    columns = [col for _, field_col, value_col in blocks for col in (field_col, value_col)]
+
+    cells_read = 0
+    rows_scanned = 0
+    for _, values in iter_column_values(sheet, columns):
+        rows_scanned += 1
+        for level_key, field_col, value_col in blocks:
+            field_value = values[field_col]
+            cells_read += 1
+
+            if field_value:
+                field_str = str(field_value).strip()
+                if field_str in FIELD_MAPPING:
+                    cells_read += 1
+                    apply_field_value(levels_data[level_key], field_str, values[value_col])
+
+    for level_data in levels_data.values():
+        fill_equipment_defaults(level_data)
+
+    if stats is not None:
+        stats['cells_read'] = stats.get('cells_read', 0) + cells_read
+        stats['scan_cells_read'] = stats.get('scan_cells_read', 0) + cells_read
+        stats['rows_scanned'] = stats.get('rows_scanned', 0) + rows_scanned
+
+    return levels_data
+
+
+# Bump when parsing rules change so cached sheets are reparsed
+PARSER_VERSION = 2
+
+# Sheet parsers selectable with --mode
+PARSE_MODES = {
+    "stream": parse_sheet_streaming,
+    "indexed": parse_sheet_indexed,
+    "scan": parse_sheet,
+}
+
+# Modes that work on read-only worksheets; the others need random cell access
+STREAMING_MODES = {"stream"}
+DEFAULT_MODE = "stream"
+
+
+def open_for_mode(filepath, mode, snapshot_dir=None):
+    """
+    Open a workbook read-only when the parse mode can stream it. With a
+    snapshot_dir, load that grid snapshot instead; it serves every mode.
+    """
+    if snapshot_dir is not None:
+        return load_snapshot(snapshot_dir)
+    return open_workbook(filepath, read_only=mode in STREAMING_MODES)
+
+
+def world_sheet_names(sheetnames):
+    """Return the World 1 through World 6 sheets present in a workbook, in order"""
+    names = []
     for world_num in range(1, 7):
         sheet_name = f"World {world_num}"
 
         # Check if sheet exists
-        if sheet_name not in wb.sheetnames:
-            print(f"\nWarning: Sheet '{sheet_name}' not found, skipping...")
+        if sheet_name not in sheetnames:
+            logger.warning("Sheet '%s' not found, skipping", sheet_name)
             continue
 
+        names.append(sheet_name)
+    return names
+
+
+def merge_stats(stats, sheet_stats):
+    """Add per-sheet counters into a run-wide stats dict"""
+    if stats is not None:
+        for key, value in sheet_stats.items():
+            stats[key] = stats.get(key, 0) + value
+
+
+def parse_workbook(wb, mode=DEFAULT_MODE, stats=None):
+    """Extract level data from all World sheets of an already loaded workbook"""
+    parse_fn = PARSE_MODES[mode]
+    all_levels_data = {}
+
+    for sheet_name in world_sheet_names(wb.sheetnames):
         sheet = wb[sheet_name]
-        levels_data = parse_sheet(sheet, sheet_name)
+        levels_data = parse_fn(sheet, sheet_name, stats)
 
         # Merge into all_levels_data
         all_levels_data.update(levels_data)
@@ -302,49 +329,196 @@ def parse_excel_file(filepath):
     return all_levels_data
 
 
+# Workbook loaded once per pool worker by _init_parse_worker
+_worker_wb = None
+
+
+def _init_parse_worker(filepath, mode, snapshot_dir, log_level):
+    global _worker_wb
+    capture_worker_logging(log_level)
+    _worker_wb = open_for_mode(filepath, mode, snapshot_dir)
+
+
+def _parse_sheet_in_worker(sheet_name, mode):
+    """Parse one sheet in a pool worker; log records are returned for the parent to replay"""
+    sheet_stats = {}
+    with LogCollector() as collector:
+        levels_data = PARSE_MODES[mode](_worker_wb[sheet_name], sheet_name, sheet_stats)
+    return levels_data, sheet_stats, collector.records
+
+
+def worker_count(value):
+    """argparse type for --workers: a process count, 0 for one per CPU"""
+    workers = int(value)
+    if workers < 0:
+        raise argparse.ArgumentTypeError(f"expected 0 or a positive number of workers, got {value}")
+    return workers
+
+
+def parse_sheets_parallel(filepath, sheet_names, mode=DEFAULT_MODE, stats=None, workers=None,
+                          snapshot_dir=None):
+    """
+    Parse sheets in a process pool. Each worker loads the workbook once and
+    parses whole sheets; results come back in sheet_names order, so the
+    output is the same as a serial parse. Returns {sheet_name: levels_data}.
+    """
+    sheets_data = {}
+    workers = max(1, min(workers or os.cpu_count() or 1, len(sheet_names)))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                             initargs=(str(filepath), mode, snapshot_dir, logger.getEffectiveLevel())) as executor:
+        results = executor.map(_parse_sheet_in_worker, sheet_names, [mode] * len(sheet_names))
+        for sheet_name, (levels_data, sheet_stats, records) in zip(sheet_names, results):
+            LogCollector.replay(records)
+            merge_stats(stats, sheet_stats)
+            sheets_data[sheet_name] = levels_data
+
+    return sheets_data
+
+
+def parse_sheets(filepath, sheet_names, mode=DEFAULT_MODE, stats=None, workers=1, snapshot_dir=None):
+    """Parse the given sheets serially or in a process pool. Returns {sheet_name: levels_data}"""
+    if not sheet_names:
+        return {}
+
+    if workers != 1 and len(sheet_names) > 1:
+        try:
+            return parse_sheets_parallel(filepath, sheet_names, mode, stats, workers, snapshot_dir)
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning("Parallel parse failed (%s), parsing serially", e)
+
+    wb = open_for_mode(filepath, mode, snapshot_dir)
+    parse_fn = PARSE_MODES[mode]
+    try:
+        return {sheet_name: parse_fn(wb[sheet_name], sheet_name, stats) for sheet_name in sheet_names}
+    finally:
+        wb.close()
+
+
+def parse_excel_file(filepath, mode=DEFAULT_MODE, stats=None, workers=1, cache=None, snapshot_dir=None):
+    """
+    Parse the Excel file and extract level data from all World sheets.
+    workers > 1 parses sheets in that many processes, 0 or None uses one per
+    CPU; 1 parses serially in this process. With a SheetCache, sheets whose
+    content hash is cached are not reparsed. With a snapshot_dir, sheets are
+    read from that grid snapshot, which is rebuilt first if it is stale.
+    """
+    if snapshot_dir is not None:
+        wb = open_snapshot(filepath, snapshot_dir)
+    else:
+        # Sheet names only, so nothing is decoded before we know what to parse
+        wb = open_workbook(filepath, read_only=True)
+    sheet_names = world_sheet_names(wb.sheetnames)
+    wb.close()
+
+    sheets_data = {}
+    sheet_keys = {}
+    if cache is not None:
+        sheet_keys = sheet_content_hashes(filepath, sheet_names, salt=PARSER_VERSION)
+        for sheet_name in sheet_names:
+            levels_data = cache.get(sheet_keys[sheet_name])
+            if levels_data is not None:
+                logger.info("%s unchanged, using cached levels", sheet_name)
+                sheets_data[sheet_name] = levels_data
+                merge_stats(stats, {'sheets_cached': 1})
+
+    to_parse = [sheet_name for sheet_name in sheet_names if sheet_name not in sheets_data]
+    parsed = parse_sheets(filepath, to_parse, mode=mode, stats=stats, workers=workers,
+                          snapshot_dir=snapshot_dir)
+    merge_stats(stats, {'sheets_parsed': len(parsed)})
+
+    if cache is not None:
+        for sheet_name, levels_data in parsed.items():
+            cache.put(sheet_keys[sheet_name], sheet_name, levels_data)
+    sheets_data.update(parsed)
+
+    # Merge into all_levels_data in sheet order
+    all_levels_data = {}
+    for sheet_name in sheet_names:
+        all_levels_data.update(sheets_data[sheet_name])
+
+    return all_levels_data
+
+
+def preserve_video_links(levels_data, existing_data):
+    """Copy video_link values from previously generated data"""
+    for level_key in levels_data:
+        if level_key in existing_data and "video_link" in existing_data[level_key]:
+            levels_data[level_key]["video_link"] = existing_data[level_key]["video_link"]
+
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=sorted(PARSE_MODES), default=DEFAULT_MODE,
+                        help="sheet parser: 'stream' reads each row once from a read-only workbook, "
+                             "'indexed' and 'scan' load the whole workbook and read every level's "
+                             "field column, in one row pass or cell by cell (default: %(default)s)")
+    parser.add_argument("--workers", type=worker_count, default=1,
+                        help="parse World sheets in this many processes, 0 for one per CPU "
+                             "(default: 1, serial)")
+    parser.add_argument("--cache-dir", default=".level_cache",
+                        help="directory for cached parsed sheets (default: %(default)s)")
+    parser.add_argument("--cache-size", type=int, default=64,
+                        help="maximum number of cached sheets kept (default: %(default)s)")
+    parser.add_argument("--full-rebuild", action="store_true",
+                        help="ignore cached sheets and reparse every World sheet")
+    add_snapshot_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    report = configure_from_args(args)
+
     excel_file = Path("Overcooked 2 Full Task Analysis.xlsx")
     output_file = Path("overcooked_levels_data.json")
 
     if not excel_file.exists():
-        print(f"Error: File '{excel_file}' not found!")
+        logger.error("File '%s' not found", excel_file)
         return
 
     # Load existing JSON to preserve video_link values
     existing_data = {}
     if output_file.exists():
-        print(f"Loading existing {output_file} to preserve video_link values...\n")
+        logger.info("Loading existing %s to preserve video_link values", output_file)
         with open(output_file, 'r', encoding='utf-8') as f:
             existing_data = json.load(f)
 
-    print(f"Parsing {excel_file}...\n")
+    logger.info("Parsing %s", excel_file)
 
     try:
-        levels_data = parse_excel_file(excel_file)
+        cache = SheetCache(args.cache_dir, max_entries=args.cache_size)
+        if args.full_rebuild:
+            cache.clear()
+
+        stats = {}
+        with report.stage("parse"):
+            levels_data = parse_excel_file(excel_file, mode=args.mode, stats=stats,
+                                           workers=args.workers, cache=cache,
+                                           snapshot_dir=snapshot_dir_from_args(args, excel_file))
+            report.count_all(stats)
 
         # Preserve video_link from existing data
-        for level_key in levels_data:
-            if level_key in existing_data and "video_link" in existing_data[level_key]:
-                levels_data[level_key]["video_link"] = existing_data[level_key]["video_link"]
+        preserve_video_links(levels_data, existing_data)
 
         # Write to JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(levels_data, f, indent=2, ensure_ascii=False)
+        with report.stage("write"):
+            write_json(output_file, levels_data, indent=2, ensure_ascii=False)
+        report.count("levels", len(levels_data))
 
-        print(f"\n✓ Successfully parsed {len(levels_data)} levels")
-        print(f"✓ Data written to {output_file}")
+        log_event(logger, logging.INFO, "Data written", output=output_file, levels=len(levels_data),
+                  mode=args.mode, cells_read=stats.get('cells_read', 0),
+                  scan_cells_read=stats.get('scan_cells_read', 0),
+                  sheets_parsed=stats.get('sheets_parsed', 0), sheets_cached=stats.get('sheets_cached', 0))
 
-        # Print summary
-        print("\nSummary:")
-        for level_key in sorted(levels_data.keys(), key=lambda x: [int(n) for n in x.replace('Level_', '').split('_')]):
+        # Per-level summary
+        for level_key in sorted(levels_data.keys(), key=level_sort_key):
             field_count = len(levels_data[level_key]) - 1  # Subtract 1 for video_link
-            print(f"  {level_key}: {field_count} fields parsed")
+            logger.debug("%s: %d fields parsed", level_key, field_count)
+
+        if args.report:
+            report.write(args.report)
 
-    except Exception as e:
-        print(f"Error parsing file: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error parsing file")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load test for query_service.py.
+
+Opens --concurrency keep-alive connections and sends --requests GET
+requests in total, cycling through a mix of filter, range, sort and top-k
+queries (or --query values), then prints throughput and latency percentiles
+as measured by the client.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+DEFAULT_QUERIES = [
+    "/levels",
+    "/levels?challenge_score=5..8&dish_washer=yes&sort=one_star_score",
+    "/levels?dish_washer=no&sort=-challenge_score&limit=5",
+    "/levels?time_to_complete=..3:00&fields=time_to_complete,challenge_score",
+    "/levels?composite_num=1,2&has_oven=yes",
+    "/levels?sort=-num_obstacles&limit=3",
+    "/levels/Level_1_1",
+    "/health",
+]
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; returns (status, body)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by server")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length) if length else b""
+    return status, body
+
+
+async def client(host, port, paths, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status, _ = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(url, queries, concurrency, requests):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    schedule = list(itertools.islice(itertools.cycle(queries), requests))
+    # Client i sends requests i, i + concurrency, ...
+    per_client = [schedule[i::concurrency] for i in range(concurrency)]
+
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, latencies, statuses) for paths in per_client if paths))
+    elapsed = time.perf_counter() - start
+    return latencies, statuses, elapsed
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(latencies, statuses, elapsed):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "statuses": statuses,
+        "latency_ms": {
+            "mean": round(statistics.fmean(ordered) * 1000, 3),
+            "p50": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99": round(percentile(ordered, 0.99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3),
+        },
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="service address (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--query", action="append", help="request path to send (repeatable)")
+    parser.add_argument("-o", "--output", help="also write the summary as JSON")
+    args = parser.parse_args()
+
+    latencies, statuses, elapsed = asyncio.run(run(args.url, args.query or DEFAULT_QUERIES,
+                                                   args.concurrency, args.requests))
+    summary = summarize(latencies, statuses, elapsed)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"✓ Summary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
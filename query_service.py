@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Local HTTP query service over the level catalog.
+
+Loads levels_with_scores.json (or a batch_build.py catalog) into in-memory
+indexes and answers filter, range, sort and top-k queries:
+
+    GET /levels?challenge_score=5..8&dish_washer=yes&sort=-one_star_score&limit=10
+    GET /levels/Level_1_1
+    GET /health
+
+Filters: field=value (comma separated values match any), field=min..max
+(inclusive, either side optional; "m:ss" times compare in seconds).
+sort=field or sort=-field (descending, missing values last), limit/offset
+page the result and fields=a,b limits the returned fields.
+
+Responses carry an ETag (If-None-Match gets 304) and are kept in an LRU
+cache; the catalog file is polled and reloaded when it changes.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import numpy as np
+
+from parse_overcooked_data import level_sort_key
+from build_facet_index import time_in_seconds
+from level_store import load_records
+from instrumentation import add_logging_arguments, configure_from_args, get_logger, log_event
+
+
+logger = get_logger("query")
+
+
+# Query parameters that are not field filters
+RESERVED_PARAMS = {"sort", "limit", "offset", "fields"}
+MAX_LIMIT = 1000
+
+
+class QueryError(ValueError):
+    """Invalid query; answered with 400"""
+
+
+def numeric_value(value):
+    """Float for a numeric or "m:ss" query value, NaN if it has none"""
+    if isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str) or not value.strip():
+        return math.nan
+    seconds = time_in_seconds(value.strip())
+    if seconds is not None:
+        return float(seconds)
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+def record_number(value):
+    """
+    Float for a typed record value: numbers and times (in seconds) as they
+    are, a single-number range as that number; NaN for yes/no, text, spans
+    and missing values
+    """
+    if isinstance(value, bool) or value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, tuple) and value[0] == value[1]:
+        return value[0]
+    return math.nan
+
+
+def text_value(value):
+    """Normalized form used for equality matches"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip().lower()
+
+
+class LevelIndex:
+    """
+    Column indexes over one version of the catalog.
+
+    Levels are kept in world/level order. Every field gets an equality index
+    (normalized value -> sorted positions); fields with numeric values also
+    get a float column, taken from the typed level_store records, and its
+    argsort, so a range is two binary searches.
+    """
+
+    def __init__(self, levels, version=""):
+        self.version = version
+        self.keys = sorted(levels, key=level_sort_key)
+        self.levels = [levels[key] for key in self.keys]
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        records = load_records({key: levels[key] for key in self.keys})
+
+        fields = []
+        for level in self.levels:
+            for field in level:
+                if field not in fields:
+                    fields.append(field)
+        self.fields = fields
+
+        self.equality = {}
+        self.numeric = {}
+        self.numeric_order = {}
+        for field in fields:
+            values = [level.get(field) for level in self.levels]
+
+            buckets = {}
+            for pos, value in enumerate(values):
+                if value is not None:
+                    buckets.setdefault(text_value(value), []).append(pos)
+            self.equality[field] = {value: np.array(pos, dtype=np.int64) for value, pos in buckets.items()}
+
+            column = np.array([record_number(record.get(field)) for record in records], dtype=np.float64)
+            if not np.isnan(column).all():
+                order = np.argsort(column, kind="stable")
+                # NaNs sort last; searches only cover the numeric prefix
+                n_numeric = int((~np.isnan(column)).sum())
+                self.numeric[field] = column
+                self.numeric_order[field] = (order[:n_numeric], column[order[:n_numeric]])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def range_mask(self, field, low, high):
+        order, sorted_values = self.numeric_order[field]
+        start = np.searchsorted(sorted_values, low, side="left")
+        stop = np.searchsorted(sorted_values, high, side="right")
+        mask = np.zeros(len(self.keys), dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def filter_mask(self, field, raw):
+        """Boolean mask over all levels for one field=raw filter"""
+        if field not in self.equality:
+            raise QueryError(f"Unknown field '{field}'")
+
+        if ".." in raw:
+            if field not in self.numeric:
+                raise QueryError(f"Field '{field}' has no numeric values for a range")
+            low_raw, high_raw = raw.split("..", 1)
+            low = numeric_value(low_raw) if low_raw else -math.inf
+            high = numeric_value(high_raw) if high_raw else math.inf
+            if math.isnan(low) or math.isnan(high):
+                raise QueryError(f"Invalid range '{raw}' for '{field}'")
+            return self.range_mask(field, low, high)
+
+        mask = np.zeros(len(self.keys), dtype=bool)
+        for option in raw.split(","):
+            number = numeric_value(option)
+            if field in self.numeric and not math.isnan(number):
+                mask |= self.range_mask(field, number, number)
+            else:
+                positions = self.equality[field].get(text_value(option))
+                if positions is not None:
+                    mask[positions] = True
+        return mask
+
+    def sorted_positions(self, positions, sort, limit):
+        """Order positions by a sort field; only the first `limit` are fully sorted"""
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in self.equality:
+            raise QueryError(f"Unknown sort field '{field}'")
+
+        if field in self.numeric:
+            values = self.numeric[field][positions]
+            # Missing values last in both directions
+            keys = np.where(np.isnan(values), np.inf, -values if descending else values)
+            if limit is not None and 0 < limit < len(positions):
+                # Everything up to the limit-th key, ties included, then a full sort of just those
+                kth = np.partition(keys, limit - 1)[limit - 1]
+                top = np.flatnonzero(keys <= kth)
+                return positions[top[np.lexsort((positions[top], keys[top]))][:limit]]
+            return positions[np.lexsort((positions, keys))]
+
+        # Missing and empty values last in both directions, in level order
+        present, missing = [], []
+        for pos in positions.tolist():
+            value = self.levels[pos].get(field)
+            if value is None or text_value(value) == "":
+                missing.append(pos)
+            else:
+                present.append((text_value(value), pos))
+        # Stable, so equal values stay in level order when reversed too
+        present.sort(key=lambda item: item[0], reverse=descending)
+        return np.array([pos for _, pos in present] + missing, dtype=np.int64)
+
+    def query(self, params):
+        """
+        Answer a parsed query string ({param: value}) with
+        {"total", "offset", "limit", "levels": [{"key": ..., fields...}]}
+        """
+        try:
+            offset = int(params.get("offset", 0))
+            limit = min(int(params.get("limit", MAX_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            raise QueryError("limit and offset must be integers")
+        if offset < 0 or limit < 0:
+            raise QueryError("limit and offset must not be negative")
+
+        mask = np.ones(len(self.keys), dtype=bool)
+        for field, raw in params.items():
+            if field not in RESERVED_PARAMS:
+                mask &= self.filter_mask(field, raw)
+        positions = np.flatnonzero(mask)
+        total = len(positions)
+
+        if "sort" in params:
+            positions = self.sorted_positions(positions, params["sort"], offset + limit)
+        page = positions[offset:offset + limit].tolist()
+
+        fields = params["fields"].split(",") if params.get("fields") else None
+        levels = []
+        for pos in page:
+            level = self.levels[pos]
+            if fields is not None:
+                level = {field: level[field] for field in fields if field in level}
+            levels.append({"key": self.keys[pos], **level})
+
+        return {"total": total, "offset": offset, "limit": limit, "levels": levels}
+
+
+def normalize_query(query):
+    """Query string with its parameters sorted; a repeated parameter keeps its last value, as in query()"""
+    params = dict(parse_qsl(query, keep_blank_values=True))
+    return urlencode(sorted(params.items()))
+
+
+def load_catalog(path):
+    """Levels dict from levels_with_scores.json or a batch_build.py catalog"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw)
+    if isinstance(data.get("levels"), dict) and "sources" in data:
+        data = data["levels"]
+    return data, hashlib.sha1(raw).hexdigest()[:16]
+
+
+class ResponseCache:
+    """LRU of encoded responses keyed by catalog version and normalized query"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class QueryService:
+    """HTTP/1.1 keep-alive server over a LevelIndex that is swapped on reload"""
+
+    def __init__(self, catalog_path, cache_size=1024, reload_interval=1.0):
+        self.catalog_path = Path(catalog_path)
+        self.cache = ResponseCache(cache_size)
+        self.reload_interval = reload_interval
+        self.index = None
+        self._mtime_ns = None
+        self.reload()
+
+    def reload(self):
+        """(Re)build the index from the catalog file; True if it was loaded"""
+        mtime_ns = os.stat(self.catalog_path).st_mtime_ns
+        levels, version = load_catalog(self.catalog_path)
+        self._mtime_ns = mtime_ns
+        if self.index is not None and version == self.index.version:
+            return False
+        # Swapped in one assignment, so a query sees either the old or the new index
+        self.index = LevelIndex(levels, version)
+        self.cache.clear()
+        log_event(logger, logging.INFO, "Catalog loaded", path=self.catalog_path,
+                  levels=len(self.index), version=version)
+        return True
+
+    async def watch(self):
+        """Poll the catalog's mtime and reload it when it changes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                if os.stat(self.catalog_path).st_mtime_ns != self._mtime_ns:
+                    await loop.run_in_executor(None, self.reload)
+            except (OSError, ValueError) as e:
+                # Half-written or removed file: keep serving the last good index
+                logger.warning("Reload of %s failed: %s", self.catalog_path, e)
+
+    def respond(self, path, query, if_none_match=None):
+        """(status, body bytes, etag) for a GET request"""
+        index = self.index
+        query = normalize_query(query)
+        cache_key = (index.version, path, query)
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            entry = self._render(index, path, query)
+            if entry[0] == 200:
+                self.cache.put(cache_key, entry)
+
+        status, body, etag = entry
+        if etag is not None and if_none_match == etag:
+            return 304, b"", etag
+        return status, body, etag
+
+    def _render(self, index, path, query):
+        try:
+            if path == "/levels":
+                result = index.query(dict(parse_qsl(query, keep_blank_values=True)))
+            elif path.startswith("/levels/"):
+                key = unquote(path[len("/levels/"):])
+                if key not in index.positions:
+                    return 404, json.dumps({"error": f"No level '{key}'"}).encode(), None
+                result = {"key": key, **index.levels[index.positions[key]]}
+            elif path == "/health":
+                result = {"levels": len(index), "version": index.version,
+                          "cache": {"entries": len(self.cache.entries), "hits": self.cache.hits,
+                                    "misses": self.cache.misses}}
+                return 200, json.dumps(result).encode(), None
+            else:
+                return 404, json.dumps({"error": f"Unknown path '{path}'"}).encode(), None
+        except QueryError as e:
+            return 400, json.dumps({"error": str(e)}).encode(), None
+
+        body = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode()
+        etag = f'"{index.version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+        return 200, body, etag
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, b'{"error":"Bad request"}', close=True)
+                    break
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                if method not in ("GET", "HEAD"):
+                    await self._send(writer, 405, b'{"error":"Method not allowed"}', close=not keep_alive)
+                else:
+                    url = urlsplit(target)
+                    status, body, etag = self.respond(url.path, url.query, headers.get("if-none-match"))
+                    await self._send(writer, status, body, etag, head=method == "HEAD", close=not keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, status, body, etag=None, head=False, close=False):
+        reason = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+                  405: "Method Not Allowed"}[status]
+        lines = [f"HTTP/1.1 {status} {reason}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {0 if status == 304 else len(body)}",
+                 "Cache-Control: no-cache",
+                 "Access-Control-Allow-Origin: *"]
+        if etag:
+            lines.append(f"ETag: {etag}")
+        if close:
+            lines.append("Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        watcher = asyncio.create_task(self.watch())
+        log_event(logger, logging.INFO, "Serving level queries", host=host, port=port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("catalog", nargs="?", default="public/levels_with_scores.json",
+                        help="levels JSON or batch catalog to serve (default: %(default)s)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-size", type=int, default=1024,
+                        help="responses kept in the LRU cache (default: %(default)s)")
+    parser.add_argument("--reload-interval", type=float, default=1.0,
+                        help="seconds between catalog change checks (default: %(default)s)")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+
+    service = QueryService(args.catalog, cache_size=args.cache_size, reload_interval=args.reload_interval)
+    print(f"✓ Serving {len(service.index)} levels at http://{args.host}:{args.port}/levels")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
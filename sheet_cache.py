@@ -0,0 +1,141 @@
+"""
+On-disk cache of parsed World sheets, keyed by a content hash of each sheet's XML part.
+
+Unchanged sheets reuse their previously parsed level dicts, so editing one
+World only reparses that World.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+CELL_RE = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+VALUE_RE = re.compile(rb'<v>(\d+)</v>')
+
+
+def sheet_part_paths(zf):
+    """Map sheet names to their worksheet XML part inside the xlsx archive"""
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {}
+    for rel in rels.iter(f"{PKG_REL_NS}Relationship"):
+        target = rel.get("Target")
+        # Targets are either absolute ("/xl/worksheets/sheet1.xml") or relative to xl/
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = target
+
+    return {
+        sheet.get("name"): targets[sheet.get(f"{REL_NS}id")]
+        for sheet in workbook.iter(f"{MAIN_NS}sheet")
+    }
+
+
+def read_shared_strings(zf):
+    """Return the shared string table as a list of raw <si> elements"""
+    try:
+        data = zf.read("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    root = ET.fromstring(data)
+    return [ET.tostring(si) for si in root.iter(f"{MAIN_NS}si")]
+
+
+def referenced_shared_strings(sheet_xml):
+    """Return the sorted shared string indexes used by t="s" cells of a sheet"""
+    indexes = set()
+    for match in CELL_RE.finditer(sheet_xml):
+        attrs, body = match.groups()
+        if body and b't="s"' in attrs:
+            value = VALUE_RE.search(body)
+            if value:
+                indexes.add(int(value.group(1)))
+    return sorted(indexes)
+
+
+def sheet_content_hashes(filepath, sheet_names, salt=""):
+    """
+    Hash each sheet's XML part together with the shared strings it references
+    and the workbook styles (number formats decide how times are read).
+    Returns {sheet_name: hex digest}.
+    """
+    hashes = {}
+    with zipfile.ZipFile(filepath) as zf:
+        parts = sheet_part_paths(zf)
+        shared_strings = read_shared_strings(zf)
+        try:
+            styles_digest = hashlib.sha256(zf.read("xl/styles.xml")).digest()
+        except KeyError:
+            styles_digest = b""
+
+        for sheet_name in sheet_names:
+            sheet_xml = zf.read(parts[sheet_name])
+            h = hashlib.sha256()
+            h.update(str(salt).encode("utf-8"))
+            h.update(styles_digest)
+            h.update(sheet_xml)
+            for index in referenced_shared_strings(sheet_xml):
+                if index < len(shared_strings):
+                    h.update(shared_strings[index])
+            hashes[sheet_name] = h.hexdigest()
+
+    return hashes
+
+
+class SheetCache:
+    """
+    Directory of <hash>.json files holding parsed level dicts for one sheet.
+    Holds at most max_entries files; the least recently used are evicted.
+    """
+
+    def __init__(self, directory, max_entries=64):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached level dict for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Touch so eviction sees this entry as recently used
+        os.utime(path)
+        return entry["levels"]
+
+    def put(self, key, sheet_name, levels_data):
+        """Store the parsed level dict for a sheet and evict old entries"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path(key).with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"sheet": sheet_name, "levels": levels_data}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries beyond max_entries"""
+        entries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Remove every cached entry"""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
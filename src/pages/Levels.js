@@ -35,8 +35,42 @@ const levelPdfMap = {
   Level_1_6: level1_6Pdf,
 };
 
+// Intersection of two ascending arrays of level positions
+const intersectSorted = (a, b) => {
+  const result = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      result.push(a[i]);
+      i++;
+      j++;
+    } else if (a[i] < b[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return result;
+};
+
+// Level map from a shard in the table layout ({fields, levels: {key: [values]}});
+// null marks a field the level doesn't have
+const decodeTable = ({ fields, levels }) => {
+  const decoded = {};
+  Object.entries(levels).forEach(([key, row]) => {
+    const level = {};
+    fields.forEach((field, i) => {
+      if (row[i] !== null) level[field] = row[i];
+    });
+    decoded[key] = level;
+  });
+  return decoded;
+};
+
 const Levels = () => {
   const [allLevelsData, setAllLevelsData] = useState({});
+  const [facetIndex, setFacetIndex] = useState(null);
   const [filteredLevels, setFilteredLevels] = useState([]);
   const [filters, setFilters] = useState({
     start_at_go: '',
@@ -58,7 +92,7 @@ const Levels = () => {
   const [searchActive, setSearchActive] = useState(false);
 
   useEffect(() => {
-    fetch(`${process.env.PUBLIC_URL}/levels_with_scores.json`)
+    const fetchJson = (url) => fetch(url)
       .then(response => {
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
@@ -68,22 +102,45 @@ const Levels = () => {
           throw new TypeError("Oops, we haven't got JSON!");
         }
         return response.json();
-      })
-      .then(data => {
-        setAllLevelsData(data);
-        setFilteredLevels(Object.keys(data));
-        
-        const startAtGoOptions = [...new Set(Object.values(data).map(level => level.start_at_go))];
-        const fixedEnvironmentOptions = [...new Set(Object.values(data).map(level => level.fixed_environment))];
-        const dishWasherOptions = [...new Set(Object.values(data).map(level => level.dish_washer))];
+      });
 
-        setFilterOptions({
-          start_at_go: startAtGoOptions,
-          fixed_environment: fixedEnvironmentOptions,
-          dish_washer: dishWasherOptions,
-        });
+    // filteredLevels follows allLevelsData (effect below) unless a search is active
+    const showLevels = (data) => {
+      setAllLevelsData(data);
+
+      const startAtGoOptions = [...new Set(Object.values(data).map(level => level.start_at_go))];
+      const fixedEnvironmentOptions = [...new Set(Object.values(data).map(level => level.fixed_environment))];
+      const dishWasherOptions = [...new Set(Object.values(data).map(level => level.dish_washer))];
+
+      setFilterOptions({
+        start_at_go: startAtGoOptions,
+        fixed_environment: fixedEnvironmentOptions,
+        dish_washer: dishWasherOptions,
+      });
+    };
+
+    // Per-world shards (table layout, see wire_format.py) render each world as
+    // soon as it arrives; the shard hash in the URL lets the browser cache
+    // unchanged worlds. Without a manifest, fall back to the single level file.
+    fetchJson(`${process.env.PUBLIC_URL}/levels/manifest.json`)
+      .then(manifest => {
+        let loaded = {};
+        return Promise.all(Object.values(manifest.shards).map(shard =>
+          fetchJson(`${process.env.PUBLIC_URL}/levels/${shard.file}?v=${shard.sha256}`)
+            .then(shard => {
+              loaded = { ...loaded, ...decodeTable(shard) };
+              showLevels(loaded);
+            })
+        ));
       })
+      .catch(() => fetchJson(`${process.env.PUBLIC_URL}/levels_with_scores.json`).then(showLevels))
       .catch(error => console.error('Error fetching level data:', error));
+
+    // Precomputed facet index; without it filters fall back to scanning every level
+    fetch(`${process.env.PUBLIC_URL}/levels_index.json`)
+      .then(response => (response.ok ? response.json() : null))
+      .then(index => setFacetIndex(index))
+      .catch(() => setFacetIndex(null));
   }, []);
 
   useEffect(() => {
@@ -104,6 +161,21 @@ const Levels = () => {
     setSearchActive(true);
     let levels = Object.keys(allLevelsData);
 
+    if (facetIndex && facetIndex.levels.length === levels.length) {
+      let positions = null;
+      Object.entries(filters).forEach(([name, value]) => {
+        if (!value) return;
+        const matches = (facetIndex.facets[name] && facetIndex.facets[name][value]) || [];
+        positions = positions === null ? matches : intersectSorted(positions, matches);
+      });
+      if (positions !== null) {
+        levels = positions.map(position => facetIndex.levels[position]);
+      }
+      setFilteredLevels(levels);
+      setNotification(`${levels.length} results found`);
+      return;
+    }
+
     if (filters.start_at_go) {
       levels = levels.filter(level => allLevelsData[level].start_at_go === filters.start_at_go);
     }
@@ -156,7 +228,7 @@ const Levels = () => {
 
     setFilteredLevels(levels);
     setNotification(`${levels.length} results found`);
-  }, [allLevelsData, filters]);
+  }, [allLevelsData, facetIndex, filters]);
 
 
   const clearFilters = () => {
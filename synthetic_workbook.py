@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic task analysis workbooks in the layout of
+Overcooked 2 Full Task Analysis.xlsx, for benchmarking the build scripts.
+
+Each "World N" sheet holds one block per level: "Level N.M" in row 1 of the
+block's header column, field labels in the next column, values in the one
+after, and an "Obstacle Type" section in the header column under the fields.
+"""
+
+import argparse
+import random
+from datetime import time
+
+import openpyxl
+
+from parse_overcooked_data import FIELD_MAPPING
+
+
+# Columns per level block: header, field, value and one spacer
+BLOCK_WIDTH = 4
+# Obstacle section rows after the last field row
+OBSTACLE_ROWS = 5
+
+
+def synthetic_value(label, rng):
+    """Return a plausible raw cell value for an Excel field label"""
+    json_key = FIELD_MAPPING[label]
+    if json_key == "time_to_complete":
+        # Excel stores game time as HH:MM where HH=minutes, MM=seconds
+        return time(rng.randint(1, 6), rng.choice([0, 30]), 0)
+    if json_key == "composite_num":
+        return rng.choice([1, 2, 3, f"{rng.randint(1, 3)} ({rng.randint(2, 4)} variations)"])
+    if json_key.startswith("has_") or json_key in ("start_at_go", "fixed_environment",
+                                                    "dish_washer", "recipe_order_fixed"):
+        return rng.choice(["Yes", "No"])
+    if json_key == "penalty_failed_composite":
+        return rng.choice(["- 30 points", "- 20 points", None])
+    if json_key == "additional_notes":
+        return rng.choice([None, None, "Moving platforms"])
+    if json_key == "challenge_score":
+        return None
+    if json_key == "points_composite_2":
+        return rng.choice([None, rng.randint(20, 120)])
+    return rng.randint(0, 600) if "score" in json_key or "points" in json_key else rng.randint(0, 12)
+
+
+def write_world_sheet(ws, world_num, levels_per_world, rows, rng):
+    labels = list(FIELD_MAPPING)
+    field_start_row = 15
+
+    for level_num in range(1, levels_per_world + 1):
+        header_col = (level_num - 1) * BLOCK_WIDTH + 1
+        ws.cell(row=1, column=header_col, value=f"Level {world_num}.{level_num}")
+
+        for offset, label in enumerate(labels):
+            row = field_start_row + offset
+            ws.cell(row=row, column=header_col + 1, value=label)
+            value = synthetic_value(label, rng)
+            if value is not None:
+                ws.cell(row=row, column=header_col + 2, value=value)
+
+        obstacle_row = field_start_row + len(labels) + 2
+        ws.cell(row=obstacle_row, column=header_col, value="Obstacle Type")
+        for k in range(rng.randint(0, OBSTACLE_ROWS)):
+            ws.cell(row=obstacle_row + 1 + k, column=header_col, value=f"Obstacle {k + 1}")
+
+        # Pad the sheet to the requested number of rows
+        if rows > obstacle_row + OBSTACLE_ROWS:
+            ws.cell(row=rows, column=header_col + 1, value="End of level")
+
+
+def generate_workbook(path, worlds=6, levels_per_world=6, rows=80, extra_sheets=0, seed=0):
+    """
+    Write a synthetic workbook with `worlds` World sheets of `levels_per_world`
+    level blocks each, padded to `rows` rows, plus `extra_sheets` non-World
+    sheets (which the obstacle scan still reads).
+    """
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+
+    for world_num in range(1, worlds + 1):
+        write_world_sheet(wb.create_sheet(f"World {world_num}"), world_num, levels_per_world, rows, rng)
+
+    for sheet_num in range(1, extra_sheets + 1):
+        ws = wb.create_sheet(f"Notes {sheet_num}")
+        for row in range(1, rows + 1):
+            ws.cell(row=row, column=1, value=f"Note {row}")
+
+    wb.save(path)
+    return path
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", help="xlsx file to write")
+    parser.add_argument("--worlds", type=int, default=6)
+    parser.add_argument("--levels", type=int, default=6, help="levels per world")
+    parser.add_argument("--rows", type=int, default=80, help="rows per World sheet")
+    parser.add_argument("--extra-sheets", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_workbook(args.output, args.worlds, args.levels, args.rows, args.extra_sheets, args.seed)
+    print(f"✓ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Watch-mode build of public/levels_with_scores.json.
+
+Polls the task analysis workbook (and an optional challenge score weights
+file) and rebuilds the level JSON and its companions after every save.
+Bursts of saves are debounced into one rebuild. Parsed sheets are kept in
+memory between rebuilds, and each input only invalidates the stages that
+depend on it:
+
+    workbook    sheets whose content hash changed are reparsed and rescanned,
+                then levels are merged, scored and written
+    weights     levels are rescored and written, nothing is reparsed
+
+A workbook that fails to load (e.g. caught half-saved) leaves the last
+good output in place and is retried on its next change.
+"""
+
+import argparse
+import copy
+import logging
+import os
+import time
+import zipfile
+from pathlib import Path
+
+from parse_overcooked_data import (DEFAULT_MODE, PARSE_MODES, PARSER_VERSION, open_for_mode,
+                                   preserve_video_links, world_sheet_names)
+from count_rows_under_string import collect_sections_in_workbook, open_values_workbook
+from add_obstacles_to_json import DEFAULT_SECTIONS, add_sections_to_levels, parse_section_spec
+from add_challenge_score_to_json import calculate_challenge_scores
+from challenge_score_engine import read_weights
+from build_level_data import write_outputs
+from sheet_cache import sheet_content_hashes
+from json_output import read_existing
+from instrumentation import RunReport, add_logging_arguments, configure_from_args, get_logger, log_event
+
+
+logger = get_logger("watch")
+
+
+POLL_INTERVAL = 0.1
+# Quiet period after the last change before rebuilding
+DEBOUNCE = 0.3
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class WatchBuild:
+    """In-memory build state for one workbook and the stages to rerun on each input change"""
+
+    def __init__(self, excel_file, output_file, mode=DEFAULT_MODE, sections=None, weights_file=None,
+                 report=None, report_file=None):
+        self.excel_file = Path(excel_file)
+        self.output_file = Path(output_file)
+        self.mode = mode
+        self.sections = DEFAULT_SECTIONS if sections is None else sections
+        self.weights_file = Path(weights_file) if weights_file else None
+        # Stage timings and counters summed over every rebuild of this session
+        self.report = report or RunReport()
+        self.report_file = report_file
+
+        self.weights = None
+        # Per sheet: content hash, parsed World levels and section scan results
+        self.sheet_hashes = {}
+        self.sheet_levels = {}
+        self.sheet_sections = {}
+        # Merged levels with section counts, before scoring
+        self.levels = None
+
+    def inputs(self):
+        """{path: input name} of the watched files"""
+        inputs = {self.excel_file: "workbook"}
+        if self.weights_file is not None:
+            inputs[self.weights_file] = "weights"
+        return inputs
+
+    def update_sheets(self):
+        """
+        Reparse and rescan the sheets whose content changed since the last
+        load. Returns the names of the changed sheets.
+        """
+        wb = open_for_mode(self.excel_file, self.mode)
+        values_wb = open_values_workbook(self.excel_file)
+        try:
+            sheet_names = list(wb.sheetnames)
+            hashes = sheet_content_hashes(self.excel_file, sheet_names, salt=PARSER_VERSION)
+            changed = [name for name in sheet_names if self.sheet_hashes.get(name) != hashes[name]]
+            if not changed and set(sheet_names) == set(self.sheet_hashes):
+                return []
+
+            parse_fn = PARSE_MODES[self.mode]
+            world_sheets = set(world_sheet_names(sheet_names))
+            patterns = {header: window for header, (_, window) in self.sections.items()}
+            sheet_levels, sheet_sections = {}, {}
+            for sheet_name in sheet_names:
+                if sheet_name not in changed:
+                    sheet_levels[sheet_name] = self.sheet_levels.get(sheet_name)
+                    sheet_sections[sheet_name] = self.sheet_sections[sheet_name]
+                    continue
+                if sheet_name in world_sheets:
+                    sheet_levels[sheet_name] = parse_fn(wb[sheet_name], sheet_name)
+                sheet_sections[sheet_name] = collect_sections_in_workbook(values_wb, patterns, [sheet_name])
+        finally:
+            wb.close()
+            values_wb.close()
+
+        # Only replaced once every changed sheet loaded
+        self.sheet_hashes = hashes
+        self.sheet_levels = {name: levels for name, levels in sheet_levels.items() if levels is not None}
+        self.sheet_sections = sheet_sections
+        return changed
+
+    def merge_levels(self):
+        """Levels of all World sheets in sheet order, with section counts"""
+        levels = {}
+        for sheet_name in self.sheet_hashes:
+            levels.update(copy.deepcopy(self.sheet_levels.get(sheet_name, {})))
+
+        # Same result as one scan of the whole workbook: occurrences in sheet order
+        section_results = {header: {} for header in self.sections}
+        for sheet_name in self.sheet_hashes:
+            for header, results in self.sheet_sections[sheet_name].items():
+                for column_key, occurrences in results.items():
+                    section_results[header].setdefault(column_key, []).extend(occurrences)
+
+        add_sections_to_levels(levels, section_results, self.sections)
+        return levels
+
+    def rebuild(self, changed_inputs):
+        """Run the stages invalidated by the changed inputs ("workbook", "weights")"""
+        started = time.perf_counter()
+        stages = []
+
+        if "weights" in changed_inputs:
+            weights = read_weights(self.weights_file) if self.weights_file.exists() else None
+            if weights != self.weights:
+                self.weights = weights
+                stages.append("score")
+
+        if "workbook" in changed_inputs or self.levels is None:
+            with self.report.stage("sheets"):
+                changed_sheets = self.update_sheets()
+                self.report.count("sheets_parsed", len(changed_sheets))
+                if changed_sheets or self.levels is None:
+                    self.levels = self.merge_levels()
+            if changed_sheets:
+                log_event(logger, logging.INFO, "Sheets reloaded", sheets=", ".join(changed_sheets))
+                stages[:0] = ["sheets"]
+                if "score" not in stages:
+                    stages.append("score")
+
+        if not stages:
+            logger.info("No content changes, outputs left as they are")
+            return False
+
+        with self.report.stage("score"):
+            levels_data = copy.deepcopy(self.levels)
+            calculate_challenge_scores(levels_data, self.weights)
+            self.report.count("levels", len(levels_data))
+        with self.report.stage("write"):
+            preserve_video_links(levels_data, read_existing(self.output_file) or {})
+            write_outputs(levels_data, self.output_file)
+        if self.report_file:
+            self.report.write(self.report_file)
+
+        log_event(logger, logging.INFO, "Rebuilt", stages="+".join(stages), levels=len(levels_data),
+                  seconds=round(time.perf_counter() - started, 3))
+        return True
+
+    def run(self, poll_interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        """Build once, then poll the inputs and rebuild after each debounced burst of changes"""
+        inputs = self.inputs()
+        signatures = {path: file_signature(path) for path in inputs}
+        pending = set(inputs.values())
+        deadline = time.monotonic()
+
+        while True:
+            if pending and time.monotonic() >= deadline:
+                try:
+                    self.rebuild(pending)
+                    pending = set()
+                except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+                    # Keep the pending inputs: the next save retries them
+                    logger.warning("Rebuild failed, keeping the last output: %s", e)
+                    deadline = float("inf")
+
+            time.sleep(poll_interval)
+            for path, name in inputs.items():
+                signature = file_signature(path)
+                if signature != signatures[path]:
+                    signatures[path] = signature
+                    pending.add(name)
+                    deadline = time.monotonic() + debounce
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("excel_file", nargs="?", default="Overcooked 2 Full Task Analysis.xlsx",
+                        help="task analysis workbook (default: %(default)s)")
+    parser.add_argument("-o", "--output", default="public/levels_with_scores.json",
+                        help="output JSON file (default: %(default)s)")
+    parser.add_argument("--mode", choices=sorted(PARSE_MODES), default=DEFAULT_MODE,
+                        help="sheet parser used for field extraction (default: %(default)s)")
+    parser.add_argument("--section", action="append", default=[], metavar="HEADER=FIELD[:WINDOW]",
+                        help="also count the rows under section header HEADER into FIELD (repeatable)")
+    parser.add_argument("--weights", metavar="FILE",
+                        help="JSON file of challenge score {term: weight} overrides, watched for changes")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE,
+                        help="seconds without changes before rebuilding (default: %(default)s)")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL,
+                        help="seconds between file checks (default: %(default)s)")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    report = configure_from_args(args)
+
+    try:
+        sections = dict(DEFAULT_SECTIONS)
+        sections.update(parse_section_spec(spec) for spec in args.section)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not Path(args.excel_file).exists():
+        logger.error("File '%s' not found", args.excel_file)
+        return
+
+    watcher = WatchBuild(args.excel_file, args.output, args.mode, sections, args.weights,
+                         report=report, report_file=args.report)
+    print(f"✓ Watching {', '.join(map(str, watcher.inputs()))} (Ctrl+C to stop)")
+    try:
+        watcher.run(args.poll_interval, args.debounce)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
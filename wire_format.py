@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Wire format of the level data the site downloads, and a local size report.
+
+The per-world shards (build_shards.py) use the table layout, which names
+each field once instead of once per level:
+
+    {"fields": ["time_to_complete", ...], "levels": {"Level_1_1": [values in field order]}}
+
+A field missing from a level is null in its row and is dropped again by
+decode_table, the same as the site's decoder in src/pages/Levels.js. Each
+shard is also published precompressed (precompressed()) for static hosts
+that serve .gz/.br files directly.
+
+Run as a script to compare the indented level JSON, minified JSON, the
+table layout and a columnar layout by raw, gzip and (with the optional
+brotli package) brotli bytes and measured decode time. The report writes
+nothing.
+"""
+
+import argparse
+import gzip
+import json
+import time
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional, .br variants and brotli sizes are left out
+    brotli = None
+
+
+COMPACT = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def level_fields(data):
+    """Union of the levels' field names in first-seen order"""
+    fields = {}
+    for level in data.values():
+        fields.update(dict.fromkeys(level))
+    return list(fields)
+
+
+def encode_table(data):
+    fields = level_fields(data)
+    return {"fields": fields,
+            "levels": {key: [level.get(field) for field in fields] for key, level in data.items()}}
+
+
+def decode_table(table):
+    fields = table["fields"]
+    return {key: {field: value for field, value in zip(fields, row) if value is not None}
+            for key, row in table["levels"].items()}
+
+
+def encode_columns(data):
+    fields = level_fields(data)
+    return {"fields": fields, "keys": list(data),
+            "columns": [[level.get(field) for level in data.values()] for field in fields]}
+
+
+def decode_columns(columnar):
+    fields, columns = columnar["fields"], columnar["columns"]
+    return {key: {field: column[i] for field, column in zip(fields, columns) if column[i] is not None}
+            for i, key in enumerate(columnar["keys"])}
+
+
+def identity(data):
+    return data
+
+
+# Layouts compared by the report: name -> (encode, decode, json.dumps options)
+FORMATS = {
+    "indented": (identity, identity, {"indent": 4}),
+    "minified": (identity, identity, COMPACT),
+    "table": (encode_table, decode_table, COMPACT),
+    "columns": (encode_columns, decode_columns, COMPACT),
+}
+
+
+# File suffixes of the precompressed variants
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def precompressed(raw):
+    """
+    {suffix: bytes} of raw compressed at the highest level: ".gz", and ".br"
+    when brotli is installed. Deterministic (no gzip timestamp), so unchanged
+    input gives unchanged files.
+    """
+    variants = {".gz": gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(raw, quality=11)
+    return variants
+
+
+def compressed_sizes(raw):
+    """{"gzip": bytes, "brotli": bytes or None} of raw compressed at the highest level"""
+    variants = precompressed(raw)
+    return {"gzip": len(variants[".gz"]), "brotli": len(variants[".br"]) if ".br" in variants else None}
+
+
+def decode_seconds(raw, decode, repeat=5):
+    """Best of repeat timings of parsing raw JSON bytes and decoding them into the level map"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(json.loads(raw))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def size_report(data):
+    """[(format, raw bytes, gzip bytes, brotli bytes or None, decode ms)] for every format"""
+    rows = []
+    for name, (encode, decode, dump_options) in FORMATS.items():
+        raw = json.dumps(encode(data), **dump_options).encode("utf-8")
+        if decode(json.loads(raw)) != data:
+            raise ValueError(f"{name} does not decode to the same levels")
+        sizes = compressed_sizes(raw)
+        rows.append((name, len(raw), sizes["gzip"], sizes["brotli"], decode_seconds(raw, decode) * 1000))
+    return rows
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("levels_file", nargs="?", default="public/levels_with_scores.json",
+                        help="scored level JSON to measure (default: %(default)s)")
+    args = parser.parse_args()
+
+    with open(args.levels_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    print(f"{'format':<10} {'raw':>10} {'gzip':>10} {'brotli':>10} {'decode ms':>10}")
+    for name, raw, gz, br, decode_ms in size_report(data):
+        br = "-" if br is None else br
+        print(f"{name:<10} {raw:>10} {gz:>10} {br:>10} {decode_ms:>10.2f}")
+    if brotli is None:
+        print("(brotli not installed, no brotli sizes)")
+    print(f"✓ {len(FORMATS)} formats compared for {len(data)} levels of {Path(args.levels_file).name}")
+
+
+if __name__ == "__main__":
+    main()
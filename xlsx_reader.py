@@ -0,0 +1,55 @@
+"""
+Lazy workbook access for the data build scripts.
+
+openpyxl's default mode materializes every cell and style of every sheet.
+Read-only mode instead streams rows straight from each sheet's XML as they
+are iterated, so only the requested sheets are decoded and cells outside
+the requested columns are dropped as soon as each row is read.
+"""
+
+import openpyxl
+
+
+def open_workbook(filepath, read_only=True, data_only=False):
+    """
+    Open a workbook; read_only=True streams rows on demand.
+    Formulas are returned as written, the same as openpyxl's default mode;
+    data_only=True returns the values Excel cached for them instead, the
+    same as pandas reads.
+    """
+    return openpyxl.load_workbook(filepath, read_only=read_only, data_only=data_only)
+
+
+def iter_sheet_rows(sheet, min_row=1, max_row=None, min_col=1, max_col=None):
+    """
+    Yield (row number, tuple of values) for a range of a sheet, padding short
+    rows with None so column positions stay aligned.
+    """
+    width = None if max_col is None else max_col - min_col + 1
+    for row_num, row in enumerate(sheet.iter_rows(min_row=min_row, max_row=max_row,
+                                                  min_col=min_col, max_col=max_col,
+                                                  values_only=True), start=min_row):
+        if width is not None and len(row) < width:
+            row = row + (None,) * (width - len(row))
+        yield row_num, row
+
+
+def iter_column_values(sheet, columns, min_row=1, max_row=None):
+    """
+    Yield (row number, {column: value}) keeping only the given 1-based columns;
+    every other cell of the row is discarded as soon as the row is read.
+    """
+    columns = sorted(set(columns))
+    if not columns:
+        return
+    min_col, max_col = columns[0], columns[-1]
+    offsets = [(col, col - min_col) for col in columns]
+    for row_num, row in iter_sheet_rows(sheet, min_row, max_row, min_col, max_col):
+        yield row_num, {col: row[offset] for col, offset in offsets}
+
+
+def first_row(sheet):
+    """Values of row 1 of a sheet"""
+    for _, row in iter_sheet_rows(sheet, min_row=1, max_row=1):
+        return row
+    return ()